@@ -1,19 +1,58 @@
 from ..technical.config import CONFIG_PARSER
+from ..parser.transport import DEFAULT_TRANSPORT
+from ..technical.rateLimiter import DEFAULT_RATE_LIMITER, Backoff, RetryAfter
+from ..technical.cache import DEFAULT_CACHE, ResponseCache
+from ..technical.telemetry import DEFAULT_TELEMETRY
+from ..parser.decoder import Loads
 # --------------------------------------------
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from retry import retry
+import time
 
 defaultApiKey = CONFIG_PARSER['api_key']
 defaultRetryNum = CONFIG_PARSER['retry_regular']
 defaultTimeout = CONFIG_PARSER['timeout_regular']
+requestTimeouts = CONFIG_PARSER['request_timeouts']
+
+defaultBaseUrl = CONFIG_PARSER['base_url']
+
+# URL paths by `IntrinioAPI` method
+ENDPOINTS = {
+    'AllCompanies': '/companies',
+    'LookupCompany': '/companies/{identifier}',
+    'AllSecuritiesByCompany': '/companies/{identifier}/securities',
+    'AllFundamentalsByCompany': '/companies/{identifier}/fundamentals',
+    'HistoricalDataForCompany': '/companies/{identifier}/historical_data/{tag}',
+    'AllSecurities': '/securities',
+    'LookupSecurity': '/securities/{identifier}',
+    'StockPricesBySecurity': '/securities/{identifier}/prices',
+    'HistoricalDataForSecurity': '/securities/{identifier}/historical_data/{tag}',
+    'AllStockExchanges': '/stock_exchanges',
+    'SecuritiesByExchange': '/stock_exchanges/{identifier}/securities',
+    'StandardizedFinancials': '/fundamentals/{identifier}/standardized_financials',
+}
 
 
 class IntrinioAPI(object):
 
-    def __init__(self, apiKey=defaultApiKey, retryNum=defaultRetryNum, timeout=defaultTimeout):
+    def __init__(self, apiKey=defaultApiKey, retryNum=defaultRetryNum, timeout=defaultTimeout, transport=None,
+                 rateLimiter=None, cache=DEFAULT_CACHE, memo=None, baseUrl=defaultBaseUrl, telemetry=DEFAULT_TELEMETRY):
         self.apiKey = apiKey
+        self.baseUrl = baseUrl
         self.retryNum = retryNum
-        self.timeout = timeout
+        self.timeout = timeout  # max backoff delay (in seconds)
+
+        if transport is None:
+            transport = DEFAULT_TRANSPORT
+        self.transport = transport
+
+        if rateLimiter is None:
+            rateLimiter = DEFAULT_RATE_LIMITER
+        self.rateLimiter = rateLimiter
+
+        self.cache = cache  # `technical.cache.ResponseCache` instance or `None` (no caching)
+        self.memo = memo  # `technical.singleFlight.SingleFlight` instance or `None` (no coalescing)
+        self.telemetry = telemetry  # `technical.telemetry.Telemetry` instance or `None` (no metrics)
 
     # Companies
     def AllCompanies(self, **params):
@@ -21,8 +60,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_all_companies_v2
         """
 
-        url = 'https://api-v2.intrinio.com/companies'
-        acom = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'AllCompanies')
+        acom = IntrinioAPI.RequestJson(self, url, 'AllCompanies', **params)
 
         return acom
 
@@ -31,8 +70,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_company_v2
         """
 
-        url = 'https://api-v2.intrinio.com/companies/{identifier}'.format(identifier=identifier)
-        lc = IntrinioAPI.RequestJson(self, url)
+        url = IntrinioAPI.Url(self.baseUrl, 'LookupCompany', identifier=identifier)
+        lc = IntrinioAPI.RequestJson(self, url, 'LookupCompany')
 
         return lc
 
@@ -41,8 +80,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_company_securities_v2
         """
 
-        url = 'https://api-v2.intrinio.com/companies/{identifier}/securities'.format(identifier=identifier)
-        asbc = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'AllSecuritiesByCompany', identifier=identifier)
+        asbc = IntrinioAPI.RequestJson(self, url, 'AllSecuritiesByCompany', **params)
 
         return asbc
 
@@ -51,8 +90,8 @@ class IntrinioAPI(object):
         Returns Fundamentals matching parameters when supplied.
         """
 
-        url = 'https://api-v2.intrinio.com/companies/{identifier}/fundamentals'.format(identifier=identifier)
-        afbc = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'AllFundamentalsByCompany', identifier=identifier)
+        afbc = IntrinioAPI.RequestJson(self, url, 'AllFundamentalsByCompany', **params)
 
         return afbc
 
@@ -61,9 +100,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_company_historical_data_v2
         """
 
-        url = 'https://api-v2.intrinio.com/companies/{identifier}/historical_data/{tag}'
-        url = url.format(identifier=identifier, tag=tag)
-        hdfc = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'HistoricalDataForCompany', identifier=identifier, tag=tag)
+        hdfc = IntrinioAPI.RequestJson(self, url, 'HistoricalDataForCompany', **params)
 
         return hdfc
 
@@ -73,8 +111,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_all_securities_v2
         """
 
-        url = 'https://api-v2.intrinio.com/securities'
-        asec = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'AllSecurities')
+        asec = IntrinioAPI.RequestJson(self, url, 'AllSecurities', **params)
 
         return asec
 
@@ -83,8 +121,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_security_by_id_v2
         """
 
-        url = 'https://api-v2.intrinio.com/securities/{identifier}'.format(identifier=identifier)
-        ls = IntrinioAPI.RequestJson(self, url)
+        url = IntrinioAPI.Url(self.baseUrl, 'LookupSecurity', identifier=identifier)
+        ls = IntrinioAPI.RequestJson(self, url, 'LookupSecurity')
 
         return ls
 
@@ -93,8 +131,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_security_stock_prices_v2
         """
 
-        url = 'https://api-v2.intrinio.com/securities/{identifier}/prices'.format(identifier=identifier)
-        sf = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'StockPricesBySecurity', identifier=identifier)
+        sf = IntrinioAPI.RequestJson(self, url, 'StockPricesBySecurity', **params)
 
         return sf
 
@@ -103,9 +141,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_security_historical_data_v2
         """
 
-        url = 'https://api-v2.intrinio.com/securities/{identifier}/historical_data/{tag}'
-        url = url.format(identifier=identifier, tag=tag)
-        hdfs = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'HistoricalDataForSecurity', identifier=identifier, tag=tag)
+        hdfs = IntrinioAPI.RequestJson(self, url, 'HistoricalDataForSecurity', **params)
 
         return hdfs
 
@@ -115,8 +152,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_all_stock_exchanges_v2
         """
 
-        url = 'https://api-v2.intrinio.com/stock_exchanges'
-        ase = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'AllStockExchanges')
+        ase = IntrinioAPI.RequestJson(self, url, 'AllStockExchanges', **params)
 
         return ase
 
@@ -125,8 +162,8 @@ class IntrinioAPI(object):
         https://docs.intrinio.com/documentation/web_api/get_stock_exchange_securities_v2
         """
 
-        url = 'https://api-v2.intrinio.com/stock_exchanges/{identifier}/securities'.format(identifier=identifier)
-        sbe = IntrinioAPI.RequestJson(self, url, **params)
+        url = IntrinioAPI.Url(self.baseUrl, 'SecuritiesByExchange', identifier=identifier)
+        sbe = IntrinioAPI.RequestJson(self, url, 'SecuritiesByExchange', **params)
 
         return sbe
 
@@ -134,31 +171,148 @@ class IntrinioAPI(object):
     def StandardizedFinancials(self, identifier):
         """ Returns standardized filing, requested with given `identifier`. """
 
-        url = 'https://api-v2.intrinio.com/fundamentals/{identifier}/standardized_financials'
-        url = url.format(identifier=identifier)
-        sf = IntrinioAPI.RequestJson(self, url)
+        url = IntrinioAPI.Url(self.baseUrl, 'StandardizedFinancials', identifier=identifier)
+        sf = IntrinioAPI.RequestJson(self, url, 'StandardizedFinancials')
 
         return sf
 
+    # Pagination
+    def Paginate(self, endpoint, *args, prefetch=True, **params):
+        """ Generator over the pages of the provided endpoint (name of the method), follows `next_page`
+        until it is `None`. With `prefetch` the next page is requested (in a background thread)
+        while the current one is processed by the consumer.
+        """
+
+        method = getattr(self, endpoint)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        try:
+            page = method(*args, **params)
+
+            while True:
+                nextPage = page.get('next_page')
+
+                if nextPage is not None:
+                    nextParams = dict(params, next_page=nextPage)
+                    if prefetch:
+                        nextPageFuture = executor.submit(method, *args, **nextParams)
+
+                yield page
+
+                if nextPage is None:
+                    break
+
+                if prefetch:
+                    page = nextPageFuture.result()
+                else:
+                    page = method(*args, **nextParams)
+
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
     # Technical
-    def RequestJson(self, url, **params):
+    def RequestJson(self, url, endpoint=None, **params):
+        """ Returns API response, `endpoint` (name of the method) defines request timeout.
+        With `memo` identical requests are sent only once (see `technical.singleFlight`).
+        """
+
+        if self.memo is None:
+            d = IntrinioAPI.RequestJsonOnce(self, url, endpoint, params)
+        else:
+            key = ResponseCache.Key(url, params)
+            d = self.memo.Do(key, IntrinioAPI.RequestJsonOnce, self, url, endpoint, params)
+
+        return d
+
+    def RequestJsonOnce(self, url, endpoint, params):
+        """ Returns API response from the cache (if any) or requests it (see `RequestWithRetries`),
+        records request metrics to the telemetry (if any).
+        """
+
+        if self.cache is not None:
+            cacheKey = ResponseCache.Key(url, params)
+            cached = self.cache.Get(cacheKey, endpoint)
+            if cached is not None:
+                if self.telemetry is not None:
+                    self.telemetry.RecordCacheHit(endpoint)
+                return Loads(cached)
 
-        @retry(tries=self.retryNum, delay=self.timeout)
-        def RequestWithOutRetry():
+        stats = {'nbytes': 0, 'retries': 0, 'throttled': 0, 'rateLimitWait': 0.0}
+        startTime = time.perf_counter()
 
-            params.update({'api_key': self.apiKey})
+        try:
+            d, content = IntrinioAPI.RequestWithRetries(self, url, endpoint, params, stats)
+        except Exception as e:
+            if self.telemetry is not None:
+                self.telemetry.Record(endpoint, time.perf_counter() - startTime, error=e, **stats)
+            raise
 
-            r = requests.get(url, params)
-            d = r.json()
+        if self.telemetry is not None:
+            self.telemetry.Record(endpoint, time.perf_counter() - startTime, **stats)
+
+        if self.cache is not None:
+            self.cache.Set(cacheKey, endpoint, content)
+
+        return d
+
+    def RequestWithRetries(self, url, endpoint, params, stats):
+        """ Sends request through the transport, returns decoded response and its raw content.
+
+        Every attempt takes a token from the shared rate limiter. Rate-limit responses (HTTP 429) and connection
+        errors are retried (up to `retryNum` attempts) with jittered exponential backoff (rate-limit responses pause
+        all the rate limiter users), other errors are raised immediately.
+        `stats` dict is updated with the number of received bytes, retries, rate-limit responses and waiting time.
+        """
+
+        requestTimeout = IntrinioAPI.RequestTimeout(endpoint)
+        params.update({'api_key': self.apiKey})
+
+        attempts = max(1, self.retryNum)  # the request is sent at least once
+        for attempt in range(attempts):
+            lastAttempt = attempt == attempts - 1
+            stats['retries'] = attempt
+
+            stats['rateLimitWait'] += self.rateLimiter.Acquire()
+
+            try:
+                r = self.transport.Get(url, params, requestTimeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if lastAttempt:
+                    raise
+                time.sleep(Backoff(attempt, cap=self.timeout))
+                continue
+
+            stats['nbytes'] += len(r.content)
+
+            if r.status_code == 429:
+                stats['throttled'] += 1
+                if lastAttempt:
+                    raise Exception('{}: API rate limit exceeded ({} attempts).'.format(endpoint, attempts))
+                delay = RetryAfter(r.headers) or Backoff(attempt, cap=self.timeout)
+                self.rateLimiter.Penalize(delay)
+                continue
+
+            d = Loads(r.content)
 
             if 'error' in d:
-                # print('=' * 120)
-                # print('REQUEST:', r.url)
-                # print('-' * 120)
-                # print('RESPONSE:', d)
-                # print('=' * 120)
-                raise Exception('`error` in API response.')
-            else:
-                return d
-
-        return RequestWithOutRetry()
+                raise Exception('{}: `error` in API response (status {}): {}.'.format(endpoint, r.status_code,
+                                                                                      d.get('message', d['error'])))
+
+            return d, r.content
+
+    @staticmethod
+    def Url(baseUrl, endpoint, **pathParams):
+        """ Returns full URL for the provided endpoint (name of the method). """
+
+        url = baseUrl + ENDPOINTS[endpoint].format(**pathParams)
+
+        return url
+
+    @staticmethod
+    def RequestTimeout(endpoint):
+        """ Returns (connect, read) timeout (in seconds) for the provided endpoint. """
+
+        timeout = requestTimeouts.get(endpoint, requestTimeouts['default'])
+
+        return timeout
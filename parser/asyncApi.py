@@ -0,0 +1,265 @@
+from ..technical.config import CONFIG_PARSER
+from ..parser.api import IntrinioAPI, defaultApiKey, defaultRetryNum, defaultTimeout, defaultBaseUrl
+from ..technical.rateLimiter import DEFAULT_RATE_LIMITER, Backoff, RetryAfter
+from ..technical.cache import DEFAULT_CACHE, ResponseCache
+from ..technical.telemetry import DEFAULT_TELEMETRY
+from ..parser.decoder import Loads
+# --------------------------------------------
+import aiohttp
+import asyncio
+import time
+
+defaultLimit = CONFIG_PARSER['async_limit']
+
+
+class AsyncIntrinioAPI(object):
+    """ asyncio version of `IntrinioAPI`: covers the same endpoints and returns the same JSON.
+    Not more than `limit` requests are in flight at once.
+
+    Should be used as an async context manager (or `Open` / `Close` should be called explicitly):
+        async with AsyncIntrinioAPI() as api:
+            companies = await api.Map('LookupCompany', company_id_list)
+    """
+
+    def __init__(self, apiKey=defaultApiKey, retryNum=defaultRetryNum, timeout=defaultTimeout, limit=defaultLimit,
+                 rateLimiter=None, cache=DEFAULT_CACHE, baseUrl=defaultBaseUrl, telemetry=DEFAULT_TELEMETRY):
+        self.apiKey = apiKey
+        self.baseUrl = baseUrl
+        self.retryNum = retryNum
+        self.timeout = timeout  # max backoff delay (in seconds)
+        self.limit = limit
+
+        if rateLimiter is None:
+            rateLimiter = DEFAULT_RATE_LIMITER
+        self.rateLimiter = rateLimiter
+
+        self.cache = cache
+        self.telemetry = telemetry
+
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        await self.Open()
+        return self
+
+    async def __aexit__(self, excType, excValue, traceback):
+        await self.Close()
+
+    async def Open(self):
+        """ Creates the session (should be called inside the running event loop). """
+
+        connector = aiohttp.TCPConnector(limit=self.limit, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, auto_decompress=True,
+                                             headers={'Accept-Encoding': 'gzip, deflate'})
+        self.semaphore = asyncio.Semaphore(self.limit)
+
+    async def Close(self):
+        """ Closes the session. """
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    # Companies
+    async def AllCompanies(self, **params):
+        """ Async version of `IntrinioAPI.AllCompanies`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'AllCompanies')
+        acom = await self.RequestJson(url, 'AllCompanies', **params)
+
+        return acom
+
+    async def LookupCompany(self, identifier):
+        """ Async version of `IntrinioAPI.LookupCompany`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'LookupCompany', identifier=identifier)
+        lc = await self.RequestJson(url, 'LookupCompany')
+
+        return lc
+
+    async def AllSecuritiesByCompany(self, identifier, **params):
+        """ Async version of `IntrinioAPI.AllSecuritiesByCompany`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'AllSecuritiesByCompany', identifier=identifier)
+        asbc = await self.RequestJson(url, 'AllSecuritiesByCompany', **params)
+
+        return asbc
+
+    async def AllFundamentalsByCompany(self, identifier, **params):
+        """ Async version of `IntrinioAPI.AllFundamentalsByCompany`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'AllFundamentalsByCompany', identifier=identifier)
+        afbc = await self.RequestJson(url, 'AllFundamentalsByCompany', **params)
+
+        return afbc
+
+    async def HistoricalDataForCompany(self, identifier, tag, **params):
+        """ Async version of `IntrinioAPI.HistoricalDataForCompany`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'HistoricalDataForCompany', identifier=identifier, tag=tag)
+        hdfc = await self.RequestJson(url, 'HistoricalDataForCompany', **params)
+
+        return hdfc
+
+    # Securities
+    async def AllSecurities(self, **params):
+        """ Async version of `IntrinioAPI.AllSecurities`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'AllSecurities')
+        asec = await self.RequestJson(url, 'AllSecurities', **params)
+
+        return asec
+
+    async def LookupSecurity(self, identifier):
+        """ Async version of `IntrinioAPI.LookupSecurity`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'LookupSecurity', identifier=identifier)
+        ls = await self.RequestJson(url, 'LookupSecurity')
+
+        return ls
+
+    async def StockPricesBySecurity(self, identifier, **params):
+        """ Async version of `IntrinioAPI.StockPricesBySecurity`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'StockPricesBySecurity', identifier=identifier)
+        spbs = await self.RequestJson(url, 'StockPricesBySecurity', **params)
+
+        return spbs
+
+    async def HistoricalDataForSecurity(self, identifier, tag, **params):
+        """ Async version of `IntrinioAPI.HistoricalDataForSecurity`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'HistoricalDataForSecurity', identifier=identifier, tag=tag)
+        hdfs = await self.RequestJson(url, 'HistoricalDataForSecurity', **params)
+
+        return hdfs
+
+    # Stock Exchanges
+    async def AllStockExchanges(self, **params):
+        """ Async version of `IntrinioAPI.AllStockExchanges`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'AllStockExchanges')
+        ase = await self.RequestJson(url, 'AllStockExchanges', **params)
+
+        return ase
+
+    async def SecuritiesByExchange(self, identifier, **params):
+        """ Async version of `IntrinioAPI.SecuritiesByExchange`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'SecuritiesByExchange', identifier=identifier)
+        sbe = await self.RequestJson(url, 'SecuritiesByExchange', **params)
+
+        return sbe
+
+    # Fundamentals
+    async def StandardizedFinancials(self, identifier):
+        """ Async version of `IntrinioAPI.StandardizedFinancials`. """
+
+        url = IntrinioAPI.Url(self.baseUrl, 'StandardizedFinancials', identifier=identifier)
+        sf = await self.RequestJson(url, 'StandardizedFinancials')
+
+        return sf
+
+    # Bulk
+    async def Paginate(self, endpoint, *args, **params):
+        """ Async generator over the pages of the provided endpoint (name of the method),
+        follows `next_page` until it is `None`.
+        """
+
+        method = getattr(self, endpoint)
+
+        page = await method(*args, **params)
+        yield page
+
+        while page.get('next_page') is not None:
+            params['next_page'] = page['next_page']
+            page = await method(*args, **params)
+            yield page
+
+    async def Map(self, endpoint, identifiers, **params):
+        """ Requests the provided endpoint (name of the method) for every identifier concurrently,
+        returns the list of responses (in the order of `identifiers`).
+        """
+
+        method = getattr(self, endpoint)
+        responses = await asyncio.gather(*[method(identifier, **params) for identifier in identifiers])
+
+        return list(responses)
+
+    # Technical
+    async def RequestJson(self, url, endpoint=None, **params):
+        """ Async version of `IntrinioAPI.RequestJson` (shares the rate limiter, cache and telemetry with it). """
+
+        if self.cache is not None:
+            cacheKey = ResponseCache.Key(url, params)
+            cached = self.cache.Get(cacheKey, endpoint)
+            if cached is not None:
+                if self.telemetry is not None:
+                    self.telemetry.RecordCacheHit(endpoint)
+                return Loads(cached)
+
+        stats = {'nbytes': 0, 'retries': 0, 'throttled': 0, 'rateLimitWait': 0.0}
+        startTime = time.perf_counter()
+
+        try:
+            d, content = await self.RequestWithRetries(url, endpoint, params, stats)
+        except Exception as e:
+            if self.telemetry is not None:
+                self.telemetry.Record(endpoint, time.perf_counter() - startTime, error=e, **stats)
+            raise
+
+        if self.telemetry is not None:
+            self.telemetry.Record(endpoint, time.perf_counter() - startTime, **stats)
+
+        if self.cache is not None:
+            self.cache.Set(cacheKey, endpoint, content)
+
+        return d
+
+    async def RequestWithRetries(self, url, endpoint, params, stats):
+        """ Async version of `IntrinioAPI.RequestWithRetries`. """
+
+        requestTimeout = IntrinioAPI.RequestTimeout(endpoint)
+        clientTimeout = aiohttp.ClientTimeout(sock_connect=requestTimeout[0], sock_read=requestTimeout[1])
+
+        params.update({'api_key': self.apiKey})
+        params = {key: str(value) for key, value in params.items()}
+
+        for attempt in range(self.retryNum):
+            lastAttempt = attempt == self.retryNum - 1
+            stats['retries'] = attempt
+
+            wait = self.rateLimiter.Reserve()
+            stats['rateLimitWait'] += wait
+            await asyncio.sleep(wait)
+
+            try:
+                async with self.semaphore:
+                    async with self.session.get(url, params=params, timeout=clientTimeout) as r:
+                        status = r.status
+                        headers = r.headers
+                        content = await r.read()
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if lastAttempt:
+                    raise
+                await asyncio.sleep(Backoff(attempt, cap=self.timeout))
+                continue
+
+            stats['nbytes'] += len(content)
+
+            if status == 429:
+                stats['throttled'] += 1
+                if lastAttempt:
+                    raise Exception('{}: API rate limit exceeded ({} attempts).'.format(endpoint, self.retryNum))
+                self.rateLimiter.Penalize(RetryAfter(headers) or Backoff(attempt, cap=self.timeout))
+                continue
+
+            d = Loads(content)
+
+            if 'error' in d:
+                raise Exception('{}: `error` in API response (status {}): {}.'.format(endpoint, status,
+                                                                                      d.get('message', d['error'])))
+
+            return d, content
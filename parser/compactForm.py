@@ -0,0 +1,152 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+import pandas as pd
+import numpy as np
+import threading
+
+
+class Interner(object):
+    """ Thread-safe dictionary of strings (e.g. tag names), which are shared by many compact forms:
+    every string is stored once, forms keep only its int32 code.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.codes = {}
+        self.lock = threading.Lock()
+
+    def Codes(self, names):
+        """ Returns int32 array with codes of the provided strings (new strings are added). """
+
+        with self.lock:
+            for name in names:
+                if name not in self.codes:
+                    self.codes[name] = len(self.names)
+                    self.names.append(name)
+
+            codes = np.array([self.codes[name] for name in names], dtype=np.int32)
+
+        return codes
+
+    def Names(self, codes):
+        """ Returns the list of strings for the provided codes. """
+
+        names = self.names
+        return [names[code] for code in codes]
+
+
+TAGS = Interner()
+PERIODS = Interner()
+
+
+class CompactForm(object):
+    """ Compact (array-backed) version of the consolidated reporting form (consider `Company.ReportingFormFrame`):
+        --- only the values, which are presented in the API responses, are stored
+        (as float32 or float64, consider `CONFIG_PARSER['compact_forms']['dtype']`);
+        --- presence bitmap (packed bits of filings x tags matrix) replaces zero-filling;
+        --- tags and periods are stored as codes of the interned strings (`TAGS`, `PERIODS`).
+
+    `ToFrame` returns the same DataFrame as the dense form (missing values are 0).
+    """
+
+    def __init__(self, periodCodes, tagCodes, values, presence):
+        self.periodCodes = periodCodes
+        self.tagCodes = tagCodes
+        self.values = values
+        self.presence = presence
+
+    @staticmethod
+    def FromEntries(data, columns, dtype=CONFIG_PARSER['compact_forms']['dtype']):
+        """ Returns `CompactForm` built from {index: (names, values)} dict, `columns` - order of the form's tags. """
+
+        position = {name: i for i, name in enumerate(columns)}
+
+        dense = np.full((len(data), len(columns)), np.nan, dtype=np.float64)
+        for i, (names, values) in enumerate(data.values()):
+            dense[i, [position[name] for name in names]] = np.array(values, dtype=np.float64)
+
+        mask = ~np.isnan(dense)
+
+        cf = CompactForm(
+            periodCodes=PERIODS.Codes(list(data)),
+            tagCodes=TAGS.Codes(columns),
+            values=dense[mask].astype(dtype),
+            presence=np.packbits(mask, axis=None),
+        )
+
+        return cf
+
+    @property
+    def shape(self):
+        return len(self.periodCodes), len(self.tagCodes)
+
+    @property
+    def index(self):
+        return pd.Index(PERIODS.Names(self.periodCodes))
+
+    @property
+    def columns(self):
+        return pd.Index(TAGS.Names(self.tagCodes), name='name')
+
+    @property
+    def periods(self):
+        """ Returns filings' periods (e.g. 'Q1-2019') as `pd.Categorical` (categories are all interned periods). """
+
+        return pd.Categorical.from_codes(self.periodCodes, categories=pd.Index(list(PERIODS.names)))
+
+    @property
+    def nbytes(self):
+        return self.periodCodes.nbytes + self.tagCodes.nbytes + self.values.nbytes + self.presence.nbytes
+
+    def Mask(self):
+        """ Returns boolean filings x tags matrix of the presented values. """
+
+        rows, cols = self.shape
+        mask = np.unpackbits(self.presence, count=rows * cols).astype(bool).reshape(rows, cols)
+
+        return mask
+
+    def ToFrame(self):
+        """ Returns the dense DataFrame (filings in rows, tags in columns, missing values are 0). """
+
+        if len(self.periodCodes) == 0:
+            return pd.DataFrame({}).T
+
+        matrix = np.zeros(self.shape, dtype=np.float64)
+        matrix[self.Mask()] = self.values
+
+        rfc = pd.DataFrame(matrix, index=self.index, columns=self.columns, copy=False)
+
+        return rfc
+
+    def Entries(self):
+        """ Returns {index: (names, values)} dict with the presented values of every filing. """
+
+        mask = self.Mask()
+        names = TAGS.Names(self.tagCodes)
+
+        data = {}
+        start = 0
+        for index, rowMask in zip(PERIODS.Names(self.periodCodes), mask):
+            end = start + int(rowMask.sum())
+            data[index] = ([name for name, present in zip(names, rowMask) if present],
+                           self.values[start:end].astype(np.float64).tolist())
+            start = end
+
+        return data
+
+    def __len__(self):
+        return len(self.periodCodes)
+
+    def __getstate__(self):
+        # codes are valid within the process only, hence strings are pickled
+        state = self.__dict__.copy()
+        state['periodCodes'] = PERIODS.Names(self.periodCodes)
+        state['tagCodes'] = TAGS.Names(self.tagCodes)
+
+        return state
+
+    def __setstate__(self, state):
+        state['periodCodes'] = PERIODS.Codes(state['periodCodes'])
+        state['tagCodes'] = TAGS.Codes(state['tagCodes'])
+        self.__dict__.update(state)
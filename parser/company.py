@@ -1,5 +1,9 @@
 from ..technical.config import CONFIG_PARSER
 from ..parser.api import IntrinioAPI
+from ..technical.singleFlight import SingleFlight
+from ..technical.taskGraph import TaskGraph
+from ..parser import decoder
+from ..parser.compactForm import CompactForm
 # --------------------------------------------
 import pandas as pd
 import numpy as np
@@ -10,69 +14,350 @@ from functools import partial
 import datetime
 import pytz
 
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'adj_open', 'adj_high', 'adj_low', 'adj_close']
+
+COMPANY_DATES = [
+    'latest_filing_date',
+    'first_fundamental_date',
+    'last_fundamental_date',
+    'first_stock_price_date',
+    'last_stock_price_date',
+]
+
+SECURITY_DATES = [
+    'first_stock_price',
+    'last_stock_price',
+    'last_stock_price_adjustment',
+    'last_corporate_action'
+]
+
+# attributes, which could be collected on demand (consider `lazy` mode of `Company`)
+LAZY_ATTRIBUTES = [
+    'CF', 'BS', 'IS',
+    'CF_list', 'BS_list', 'IS_list',
+    'info',
+    'securitiesList', 'securities',
+    'mainSecurity', 'mainSecurityInfo',
+    'mainSecurityPrice', 'dividend',
+    'marketcap', 'sharesOut',
+    'filingDates',
+]
+
 
 class Company(object):
 
-    def __init__(self, company_id, verbose=False):
+    def __init__(self, company_id, verbose=False, memo=None, lazy=False, prefetch=(),
+                 compact=CONFIG_PARSER['compact_forms']['enabled'], executor=None, requestExecutor=None):
+        """ `memo` - `technical.singleFlight.SingleFlight` instance, which could be shared with other builds
+        (e.g. with `Universe`), by default identical requests are coalesced within this build only
+        (in lazy mode - within the first `Load`, the memo is not kept by the company afterwards).
+        `lazy` - if True, attributes (consider `LAZY_ATTRIBUTES`) are collected on the first access
+        (with the attributes they depend on), `prefetch` - attributes, which are collected at once (concurrently).
+        `compact` - if True, reporting forms (`CF`, `BS`, `IS`) are stored as `parser.compactForm.CompactForm`
+        (in `compactForms` dict), the attributes return dense DataFrames built on the first access
+        (consider `DenseForm`).
+        `executor` / `requestExecutor` - `concurrent.futures.Executor` for the initialization stages / for the requests
+        of filings and securities, which are made within the stages (new thread pools, if not provided);
+        the executors should be different: stages wait for the requests (consider `parser.companyBatch`).
+        """
 
         startTime = datetime.datetime.now()
 
         self.company_id = company_id
+        self.lazy = lazy
+        self.compact = compact
+
+        if lazy:
+            self.memo = memo  # a new one is created by `Load`, if not provided
+            self.verbose = verbose
+            self.initializationTimings = {}
+        else:
+            api, apiBulk, apiForms = Company.ApiClients(memo)
+
+            graph = Company.InitializationGraph(company_id, verbose, api, apiBulk, apiForms, compact, requestExecutor)
+            results = graph.Run(executor=executor)
+            self.initializationTimings = graph.timings
+
+            self.StoreStages(results)
+
+        self.initializationDate = datetime.datetime.now(pytz.timezone('US/Eastern'))
+        self.updateDate = []
+        self.updateInfo = []
+
+        if lazy:
+            self.Load(*prefetch)
+        else:
+            self.filingDates = self.FilingDatesClean()
+
+        endTime = datetime.datetime.now()
+
+        if verbose:
+            minutes = round((endTime - startTime).total_seconds() / 60, 2)
+            print('{}: initialization completed (in {} minutes)'.format(company_id, minutes))
+            if not lazy:
+                print(graph.Report())
+
+    def __getattr__(self, name):
+        """ Returns dense reporting form (compact mode) or collects the attribute on the first access (lazy mode). """
+
+        if name in self.__dict__.get('compactForms', {}):
+            return self.DenseForm(name)
+
+        if name in LAZY_ATTRIBUTES and self.__dict__.get('lazy', False):
+            self.Load(name)
+            if name in self.__dict__:
+                return self.__dict__[name]
+            if name in self.__dict__.get('compactForms', {}):
+                return self.DenseForm(name)
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('memo', None)  # is not picklable
+        state.pop('denseForms', None)  # are rebuilt from `compactForms` on access
+
+        return state
+
+    def Load(self, *names):
+        """ Collects the provided attributes (and the attributes they depend on), which are not collected yet. """
+
+        names = [name for name in names if not self.Collected(name)]
+        if len(names) == 0:
+            return
+
+        for name in names:
+            assertionText = '{}: `{}` could not be collected.'.format(self.company_id, name)
+            assert name in LAZY_ATTRIBUTES, assertionText
+
+        verbose = self.__dict__.get('verbose', False)
+        memo = self.__dict__.pop('memo', None)  # is used by the first load only (responses are not kept further)
+        if memo is None:
+            memo = SingleFlight()
+
+        compact = self.__dict__.get('compact', False)
+        graph = Company.InitializationGraph(self.company_id, verbose, *Company.ApiClients(memo), compact=compact)
+
+        targets = set()
+        for name in names:
+            if name == 'filingDates':
+                targets.update(['BS_list', 'BS', 'IS', 'CF'])
+            elif name == 'mainSecurityInfo':
+                targets.add('mainSecurity')
+            else:
+                targets.add(name)
+
+        known = {}
+        for stage in graph.tasks:
+            if stage == 'mainSecurity':
+                if 'mainSecurity' in self.__dict__:
+                    known[stage] = (self.mainSecurity, self.mainSecurityInfo)
+            elif self.Collected(stage):
+                known[stage] = self.FormObject(stage)
+
+        results = graph.Run(targets=targets, known=known)
+        self.initializationTimings.update(graph.timings)
+        self.StoreStages(results)
+
+        if 'filingDates' in names:
+            self.filingDates = self.FilingDatesClean()
+
+        if verbose:
+            print(graph.Report())
 
-        self.CF = Company.ReportingFormConsolidated(company_id, 'CF', verbose)
-        self.BS = Company.ReportingFormConsolidated(company_id, 'BS', verbose)
-        self.IS = Company.ReportingFormConsolidated(company_id, 'IS', verbose)
+    def Collected(self, name):
+        """ Checks if the attribute is collected (without collecting it in lazy mode). """
 
-        self.CF_list = Company.ReportingFormList(company_id, 'CF', verbose)
-        self.BS_list = Company.ReportingFormList(company_id, 'BS', verbose)
-        self.IS_list = Company.ReportingFormList(company_id, 'IS', verbose)
+        return name in self.__dict__ or name in self.__dict__.get('compactForms', {})
+
+    def DenseForm(self, name):
+        """ Returns dense DataFrame of the compact reporting form, the frame is built on the first access and is
+        shared by the next ones (until the form is updated), so it should be treated as read-only
+        (`.copy()` it for modifications).
+        """
+
+        if 'denseForms' not in self.__dict__:
+            self.denseForms = {}
+        if name not in self.denseForms:
+            self.denseForms[name] = self.compactForms[name].ToFrame()
+
+        return self.denseForms[name]
+
+    def FormObject(self, name):
+        """ Returns the attribute as it is stored (`CompactForm` for reporting forms in compact mode). """
+
+        compactForms = self.__dict__.get('compactForms', {})
+        if name in compactForms:
+            return compactForms[name]
+
+        return getattr(self, name)
+
+    def StoreStages(self, results):
+        """ Sets attributes from the results of `InitializationGraph` stages. """
+
+        for stage, result in results.items():
+            if isinstance(result, CompactForm):
+                if 'compactForms' not in self.__dict__:
+                    self.compactForms = {}
+                self.compactForms[stage] = result
+                self.__dict__.get('denseForms', {}).pop(stage, None)
+            elif stage == 'mainSecurity':
+                self.mainSecurity, self.mainSecurityInfo = result
+            elif stage in ['mainSecurityPrice', 'dividend']:
+                if results['mainSecurity'][0] is not None:  # are collected only if the main security is detected
+                    setattr(self, stage, result)
+            else:
+                setattr(self, stage, result)
+
+    def Update(self, verbose=False, memo=None):
+        """ Updates the company's data incrementally:
+        -- only the filings, which are not presented in the reporting forms' lists, are requested;
+        -- prices, dividend, marketcap and sharesOut are extended since their last dates
+        (the whole price history is reloaded, if the main security's prices were adjusted since the last update);
+        -- `info` is reloaded, `filingDates` are recomputed.
+        `updateDate` and `updateInfo` (number of new rows by attribute) are appended.
+        The list of securities (and the main security) is not updated.
+        """
+
+        startTime = datetime.datetime.now()
 
-        self.info = Company.CompanyInfo(company_id, verbose)
+        self.__dict__.pop('memo', None)  # responses of the initialization are outdated
 
-        self.securitiesList = Company.SecuritiesList(company_id, verbose)
-        security_id_list = self.securitiesList['id'].tolist()
-        self.securities = Company.Securities(security_id_list, verbose)
+        api, apiBulk, apiForms = Company.ApiClients(memo)
+        graph = TaskGraph()
+
+        for form in ['CF', 'BS', 'IS']:
+            graph.Add(form, Company.UpdateReportingForm, self.company_id, form, self.FormObject(form),
+                      getattr(self, form + '_list'), verbose, api=apiForms)
+
+        graph.Add('info', Company.CompanyInfo, self.company_id, verbose, api=api)
 
-        ms, msi = Company.MainSecurity(self.securities, verbose)
-        self.mainSecurity = ms
-        self.mainSecurityInfo = msi
-        
         if self.mainSecurity is not None:
-            self.mainSecurityPrice = Company.Price(self.mainSecurity, verbose)
-            self.dividend = Company.Dividend(self.mainSecurity, verbose)
+            graph.Add('securityInfo', Company.SecurityInfo, self.mainSecurity, api=api)
+            graph.Add('mainSecurityPrice', self.UpdatedPrice, verbose, api=apiBulk, dependencies=['securityInfo'])
+            graph.Add('dividend', Company.Dividend, self.mainSecurity, verbose, api=apiBulk,
+                      start_date=Company.LastDate(self.dividend))
 
-        self.marketcap = Company.MarketCap(company_id, verbose)
-        self.sharesOut = Company.SharesOut(company_id, verbose)
+        graph.Add('marketcap', Company.MarketCap, self.company_id, verbose, api=apiBulk,
+                  start_date=Company.LastDate(self.marketcap))
+        graph.Add('sharesOut', Company.SharesOut, self.company_id, verbose, api=apiBulk,
+                  start_date=Company.LastDate(self.sharesOut))
 
-        self.initializationDate = datetime.datetime.now(pytz.timezone('US/Eastern'))
-        self.updateDate = []
-        self.updateInfo = []
+        results = graph.Run()
+
+        updateInfo = {}
+
+        for form in ['CF', 'BS', 'IS']:
+            rfc, rfl, newCount = results[form]
+            self.StoreStages({form: rfc})
+            setattr(self, form + '_list', rfl)
+            updateInfo[form] = newCount
+
+        self.info = results['info']
+
+        if self.mainSecurity is not None:
+            self.securities.loc[self.mainSecurity] = results['securityInfo']
+
+            price, reloaded = results['mainSecurityPrice']
+            updateInfo['mainSecurityPrice'] = len(price) - (0 if reloaded else len(self.mainSecurityPrice))
+            self.mainSecurityPrice = price
+
+            dividend = Company.ExtendDated(self.dividend, results['dividend'])
+            updateInfo['dividend'] = Company.LengthDiff(dividend, self.dividend)
+            self.dividend = dividend
+
+        for attr in ['marketcap', 'sharesOut']:
+            extended = Company.ExtendDated(getattr(self, attr), results[attr])
+            updateInfo[attr] = Company.LengthDiff(extended, getattr(self, attr))
+            setattr(self, attr, extended)
 
         self.filingDates = self.FilingDatesClean()
 
+        self.updateDate.append(datetime.datetime.now(pytz.timezone('US/Eastern')))
+        self.updateInfo.append(updateInfo)
+
         endTime = datetime.datetime.now()
 
         if verbose:
             minutes = round((endTime - startTime).total_seconds() / 60, 2)
-            print('{}: initialization completed (in {} minutes)'.format(company_id, minutes))
+            print('{}: update completed (in {} minutes): {}'.format(self.company_id, minutes, updateInfo))
+            print(graph.Report())
+
+    def UpdatedPrice(self, securityInfo, verbose=False, api=None):
+        """ Returns (price, reloaded): main security price extended since its last date,
+        or the whole reloaded price history, if the prices were adjusted since the last known adjustment.
+        """
+
+        lastAdjustment = self.securities.loc[self.mainSecurity, 'last_stock_price_adjustment']
+        newAdjustment = securityInfo['last_stock_price_adjustment']
+        reloaded = not pd.isnull(newAdjustment) and (pd.isnull(lastAdjustment) or newAdjustment > lastAdjustment)
+
+        if reloaded:
+            price = Company.Price(self.mainSecurity, verbose, api=api)
+        else:
+            start_date = Company.LastDate(self.mainSecurityPrice)
+            new = Company.Price(self.mainSecurity, verbose, api=api, start_date=start_date)
+            price = Company.ExtendDated(self.mainSecurityPrice, new)
+
+        return price, reloaded
+
+    @staticmethod
+    def ApiClients(memo=None):
+        """ Returns API clients (regular, bulk, reporting forms), which share `memo` (a new one, if not provided). """
+
+        if memo is None:
+            memo = SingleFlight()
+        api = IntrinioAPI(memo=memo)
+        apiBulk = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'], memo=memo)
+        apiForms = IntrinioAPI(timeout=60, memo=memo)
+
+        return api, apiBulk, apiForms
 
     @staticmethod
-    def CompanyInfo(company_id, verbose=False):
+    def InitializationGraph(company_id, verbose=False, api=None, apiBulk=None, apiForms=None, compact=False,
+                            requestExecutor=None):
+        """ Returns `technical.taskGraph.TaskGraph` with the stages of `Company` initialization:
+        independent stages are executed concurrently, only the main security data waits for `securities`.
+        """
+
+        graph = TaskGraph()
+
+        for form in ['CF', 'BS', 'IS']:
+            graph.Add(form, Company.ReportingFormConsolidated, company_id, form, verbose, api=apiForms, compact=compact,
+                      executor=requestExecutor)
+            graph.Add(form + '_list', Company.ReportingFormList, company_id, form, verbose, api=apiForms)
+
+        graph.Add('info', Company.CompanyInfo, company_id, verbose, api=api)
+
+        graph.Add('securitiesList', Company.SecuritiesList, company_id, verbose, api=api)
+        graph.Add('securities',
+                  lambda sl: Company.Securities(sl['id'].tolist(), verbose, api=api, executor=requestExecutor),
+                  dependencies=['securitiesList'])
+        graph.Add('mainSecurity', Company.MainSecurity, verbose, dependencies=['securities'])
+
+        # price and dividend are collected only if the main security is detected
+        def MainSecurityLoader(loader):
+            return lambda msr: None if msr[0] is None else loader(msr[0], verbose, api=apiBulk)
+
+        graph.Add('mainSecurityPrice', MainSecurityLoader(Company.Price), dependencies=['mainSecurity'])
+        graph.Add('dividend', MainSecurityLoader(Company.Dividend), dependencies=['mainSecurity'])
+
+        graph.Add('marketcap', Company.MarketCap, company_id, verbose, api=apiBulk)
+        graph.Add('sharesOut', Company.SharesOut, company_id, verbose, api=apiBulk)
+
+        return graph
+
+    @staticmethod
+    def CompanyInfo(company_id, verbose=False, api=None):
         """ Returns general information about the company. """
 
-        api = IntrinioAPI()
+        if api is None:
+            api = IntrinioAPI()
 
         lc = api.LookupCompany(company_id)
         ci = pd.Series(data=lc, name=company_id)
 
-        dates = [
-            'latest_filing_date',
-            'first_fundamental_date',
-            'last_fundamental_date',
-            'first_stock_price_date',
-            'last_stock_price_date',
-        ]
-        for date in dates:
+        for date in COMPANY_DATES:
             ci[date] = pd.to_datetime(ci[date])
 
         if verbose:
@@ -82,59 +367,161 @@ class Company(object):
 
     # Financials
     @staticmethod
-    def ReportingFormConsolidated(company_id, form, verbose=False):
+    def ReportingFormConsolidated(company_id, form, verbose=False, api=None, compact=False, executor=None):
         """ Returns pandas.DataFrame, which contain all filings of the provided form
-        for the provided ticker.
+        for the provided ticker (`parser.compactForm.CompactForm`, if `compact`).
+        `executor` - `concurrent.futures.Executor` for the filings' requests (a new thread pool, if not provided).
         """
 
-        lrf = Company.ReportingFormList(company_id=company_id, form=form)
+        lrf = Company.ReportingFormList(company_id=company_id, form=form, api=api)
 
         reporting_form_id_list = lrf['id'].tolist()
         index_list = lrf.index.tolist()
 
         data = {}
-        pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
 
-        api = IntrinioAPI(timeout=60)
-        f = partial(Company.ReportingForm, api=api)
+        if api is None:
+            api = IntrinioAPI(timeout=60)
+        f = partial(Company.ReportingFormEntries, api=api)
+
+        if executor is None:
+            pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
+            entries = pool.imap(f, reporting_form_id_list)
+        else:
+            entries = executor.map(f, reporting_form_id_list)
 
-        for index, rf in zip(index_list, pool.imap(f, reporting_form_id_list)):
-            if rf is not None:
-                data[index] = rf
-        pool.close()
-        pool.join()
+        for index, (names, values) in zip(index_list, entries):
+            if len(names) > 0:
+                data[index] = (names, values)
+
+        if executor is None:
+            pool.close()
+            pool.join()
 
         if verbose:
             print('{}: ReportingFormConsolidated - {} was collected.'.format(company_id, form))
 
-        rfc = pd.DataFrame(data).T
-        rfc.fillna(0, inplace=True)
+        if compact:
+            rfc = CompactForm.FromEntries(data, Company.FormColumns(data))
+        else:
+            rfc = Company.ReportingFormFrame(data)
+
+        return rfc
+
+    @staticmethod
+    def UpdateReportingForm(company_id, form, rfc, rfl, verbose=False, api=None):
+        """ Returns (consolidated form, list of filings, number of new filings) for the provided form:
+        only the filings, which are not presented in the provided list `rfl`, are requested,
+        the rest are taken from the provided consolidated form `rfc` (DataFrame or `CompactForm`).
+        """
+
+        rflNew = Company.ReportingFormList(company_id=company_id, form=form, api=api)
+
+        known = set(rfl['id'])
+        new_id_list = [reporting_form_id for reporting_form_id in rflNew['id'] if reporting_form_id not in known]
+
+        newEntries = {}
+        if len(new_id_list) > 0:
+            pool = multiprocessing.Pool(processes=min(CONFIG_PARSER['processes'], len(new_id_list)))
+            f = partial(Company.ReportingFormEntries, api=api)
+            newEntries = dict(zip(new_id_list, pool.map(f, new_id_list)))
+            pool.close()
+            pool.join()
+
+        if isinstance(rfc, CompactForm):
+            oldRows = rfc.Entries()
+        else:
+            columns = rfc.columns.tolist()
+            oldRows = {index: (columns, row) for index, row in zip(rfc.index, rfc.values.tolist())}
+
+        data = {}
+        for index, reporting_form_id in zip(rflNew.index, rflNew['id']):
+            if reporting_form_id in newEntries:
+                names, values = newEntries[reporting_form_id]
+                if len(names) > 0:
+                    data[index] = (names, values)
+            elif index in oldRows:
+                data[index] = oldRows[index]
+
+        if verbose:
+            print('{}: {} - {} new filings were collected.'.format(company_id, form, len(new_id_list)))
+
+        if isinstance(rfc, CompactForm):
+            rfcNew = CompactForm.FromEntries(data, Company.FormColumns(data))
+        else:
+            rfcNew = Company.ReportingFormFrame(data)
+
+        return rfcNew, rflNew, len(new_id_list)
+
+    @staticmethod
+    def ReportingFormFrame(data):
+        """ Returns consolidated reporting form (filings in rows, tags in columns, missing values are 0)
+        built from {index: (names, values)} dict with a single allocation (columns are ordered by `FormColumns`).
+        """
+
+        if len(data) == 0:
+            return pd.DataFrame(data).T
+
+        columns = Company.FormColumns(data)
+        position = {name: i for i, name in enumerate(columns)}
+
+        matrix = np.zeros((len(data), len(columns)), dtype=np.float64)
+        for i, (names, values) in enumerate(data.values()):
+            row = np.array(values, dtype=np.float64)
+            row[np.isnan(row)] = 0
+            matrix[i, [position[name] for name in names]] = row
+
+        rfc = pd.DataFrame(matrix, index=pd.Index(list(data)), columns=pd.Index(columns, name='name'), copy=False)
 
         return rfc
 
+    @staticmethod
+    def FormColumns(data):
+        """ Returns tags of the consolidated form built from {index: (names, values)} dict in the order of
+        `pd.DataFrame` alignment: as is, if all filings have the same tags (in the same order), sorted otherwise.
+        """
+
+        namesList = [names for names, _ in data.values()]
+        if len(namesList) == 0:
+            return []
+
+        columns = namesList[0]
+        if any(names != columns for names in namesList[1:]):
+            columns = list(dict.fromkeys(name for names in namesList for name in names))
+            try:
+                columns = sorted(columns)
+            except TypeError:
+                pass
+
+        return columns
+
     @staticmethod
     def ReportingForm(reporting_form_id, api=None):
         """ Returns reporting form's values (in a Series format). """
 
+        names, values = Company.ReportingFormEntries(reporting_form_id, api)
+
+        if len(names) > 0:
+            rf = pd.Series(data=values, index=pd.Index(names, name='name'))
+        else:
+            rf = None
+
+        return rf
+
+    @staticmethod
+    def ReportingFormEntries(reporting_form_id, api=None):
+        """ Returns reporting form's tag names and values (two lists). """
+
         if api is None:
             api = IntrinioAPI()
 
         sf = api.StandardizedFinancials(reporting_form_id)
         sf = sf['standardized_financials']
 
-        pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
-        sfr = pool.map(Company.RestructureRawReportingFormEntry, sf)
-        pool.close()
-        pool.join()
+        names = [entry['data_tag']['name'] for entry in sf]
+        values = [entry['value'] for entry in sf]
 
-        rf = pd.DataFrame(sfr)
-
-        if rf.shape != (0, 0):
-            rf = pd.Series(data=rf['value'].values, index=rf['name'])
-        else:
-            rf = None
-
-        return rf
+        return names, values
 
     @staticmethod
     def RestructureRawReportingFormEntry(row):
@@ -143,13 +530,13 @@ class Company(object):
         rowCopy = row.copy()
 
         value = rowCopy.pop('value')
-        rowNew = rowCopy.pop('data_tag')
+        rowNew = rowCopy.pop('data_tag').copy()
         rowNew.update({'value': value})
 
         return rowNew
 
     @staticmethod
-    def ReportingFormList(company_id, form, verbose=False):
+    def ReportingFormList(company_id, form, verbose=False, api=None):
         """ Returns a list of existing filings for the provided form for the provided Company
         (in a DataFrame format).
         """
@@ -160,7 +547,8 @@ class Company(object):
             'CF': 'cash_flow_statement',
         }
 
-        api = IntrinioAPI()
+        if api is None:
+            api = IntrinioAPI()
 
         afbc = api.AllFundamentalsByCompany(
             identifier=company_id,
@@ -184,24 +572,14 @@ class Company(object):
 
     # Securities
     @staticmethod
-    def SecuritiesList(company_id, verbose=False):
+    def SecuritiesList(company_id, verbose=False, api=None):
         """ Returns a list of existing securities for the provided Company (in a DataFrame format). """
 
-        api = IntrinioAPI()
-
-        asbc = api.AllSecuritiesByCompany(company_id)
-
-        asbcSecurities = asbc['securities']
-        asbcNextPage = asbc['next_page']
-
-        while asbcNextPage is not None:
-
-            asbcNextPart = api.AllSecuritiesByCompany(company_id, next_page=asbcNextPage)
-
-            asbcSecurities += asbcNextPart['securities']
-            asbcNextPage = asbcNextPart['next_page']
+        if api is None:
+            api = IntrinioAPI()
 
-        sl = pd.DataFrame(asbcSecurities)
+        pages = api.Paginate('AllSecuritiesByCompany', company_id)
+        sl, _ = Company.FrameFromPages(pages, 'securities')
 
         if verbose:
             print('{}: SecuritiesList was collected.'.format(company_id))
@@ -209,15 +587,18 @@ class Company(object):
         return sl
 
     @staticmethod
-    def Securities(security_id_list, verbose=False):
-        """ Returns the list of all securities with general information about them (in DataFrame format). """
-
-        pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
-
-        si_list = pool.map(Company.SecurityInfo, security_id_list)
+    def Securities(security_id_list, verbose=False, api=None, executor=None):
+        """ Returns the list of all securities with general information about them (in DataFrame format).
+        `executor` - `concurrent.futures.Executor` for the requests (a new thread pool, if not provided).
+        """
 
-        pool.close()
-        pool.join()
+        if executor is None:
+            pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
+            si_list = pool.map(partial(Company.SecurityInfo, api=api), security_id_list)
+            pool.close()
+            pool.join()
+        else:
+            si_list = list(executor.map(partial(Company.SecurityInfo, api=api), security_id_list))
 
         securities = pd.concat(si_list, axis=1).T
 
@@ -227,22 +608,16 @@ class Company(object):
         return securities
 
     @staticmethod
-    def SecurityInfo(security_id):
+    def SecurityInfo(security_id, api=None):
         """ Returns general information about the security. """
 
-        api = IntrinioAPI()
+        if api is None:
+            api = IntrinioAPI()
 
         ls = api.LookupSecurity(security_id)
         si = pd.Series(data=ls, name=security_id)
 
-        dates = [
-            'first_stock_price',
-            'last_stock_price',
-            'last_stock_price_adjustment',
-            'last_corporate_action'
-        ]
-
-        for date in dates:
+        for date in SECURITY_DATES:
             si[date] = pd.to_datetime(si[date])
 
         return si
@@ -254,9 +629,8 @@ class Company(object):
 
         msc, msci = Company.MainSecurity_conditions(securities)
 
-        sc = Company.SecuritiesCoverage(securities)
-        if sc is not None:
-            scCount = sc.count() / len(sc)
+        scCount = Company.SecuritiesCoverageShare(securities)
+        if scCount is not None:
 
             if msc is not None:
                 coverageShare = scCount[msc]
@@ -353,6 +727,44 @@ class Company(object):
             main_security_info = 'Could not detect primary security among {} (all) securities.'.format(len(sec))
             return main_security, main_security_info
 
+    @staticmethod
+    def SecuritiesCoverageShare(securities):
+        """ Returns the Series with the share of days (between first and last company's securities price dates),
+        on which the security was active (the same as `count() / len()` of `SecuritiesCoverage` DataFrame),
+        it is computed from the securities' date intervals without daily DataFrame.
+        """
+
+        mask = (securities['code'].values == 'EQS') & (securities['currency'].values == 'USD')
+        security_id_list = securities['id'].values[mask]
+        firstDates = np.array(securities['first_stock_price'].tolist(), dtype=object)[mask]  # Timestamps
+        lastDates = np.array(securities['last_stock_price'].tolist(), dtype=object)[mask]
+
+        fspd = min([date for date in firstDates if not pd.isnull(date)], default=None)
+        lspd = max([date for date in lastDates if not pd.isnull(date)], default=None)
+
+        if fspd is None or lspd is None:
+            return None
+
+        day = pd.Timedelta(days=1)
+        total = (lspd - fspd) // day + 1 if lspd >= fspd else 0
+
+        counts = {}
+        for security_id, first, last in zip(security_id_list, firstDates, lastDates):
+            if first is None or last is None:
+                continue  # the security is not presented in the coverage
+
+            # number of days `fspd + k` within [first, last] (as `.loc` slicing: NaT `last` is open end)
+            if pd.isnull(first):
+                counts[security_id] = 0
+            else:
+                firstDay = -((fspd - first) // day)  # ceil
+                lastDay = total - 1 if pd.isnull(last) else (last - fspd) // day
+                counts[security_id] = max(0, min(lastDay, total - 1) - max(firstDay, 0) + 1)
+
+        scCount = pd.Series(counts, dtype=np.int64) / total
+
+        return scCount
+
     @staticmethod
     def SecuritiesCoverage(securities):
         """ Returns the DataFrame, where:
@@ -387,18 +799,19 @@ class Company(object):
 
     # Prices
     @staticmethod
-    def Price(security_id, verbose=False):
-        """" Returns price dynamics for the provided Company (in DataFrame format). """
+    def Price(security_id, verbose=False, api=None, start_date=None):
+        """" Returns price dynamics for the provided Company (in DataFrame format),
+        only since `start_date` (inclusive), if it is provided.
+        """
 
-        api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
+        if api is None:
+            api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
 
-        spbs = api.StockPricesBySecurity(security_id, page_size=10000)
+        pages = api.Paginate('StockPricesBySecurity', security_id, **Company.BulkParams(start_date))
+        price, spbs = Company.FrameFromPages(pages, 'stock_prices', dateColumns=['date'], floatColumns=PRICE_COLUMNS)
         assert spbs['security']['currency'] == 'USD'
         assert spbs['security']['id'] == security_id
 
-        price = pd.DataFrame(spbs['stock_prices'])
-
-        price['date'] = pd.to_datetime(price['date'])
         price.sort_values(by='date', inplace=True, ascending=False)
         price.set_index('date', inplace=True)
 
@@ -408,16 +821,17 @@ class Company(object):
         return price
 
     @staticmethod
-    def MarketCap(company_id, verbose=False):
-        """" Returns marketcap dynamics for the provided Company (in DataFrame format). """
-
-        api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
+    def MarketCap(company_id, verbose=False, api=None, start_date=None):
+        """" Returns marketcap dynamics for the provided Company (in DataFrame format),
+        only since `start_date` (inclusive), if it is provided.
+        """
 
-        hdfc = api.HistoricalDataForCompany(identifier=company_id, tag='marketcap', page_size=10000)
+        if api is None:
+            api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
 
-        marketCap = pd.DataFrame(hdfc['historical_data'])
+        pages = api.Paginate('HistoricalDataForCompany', company_id, 'marketcap', **Company.BulkParams(start_date))
+        marketCap, _ = Company.FrameFromPages(pages, 'historical_data', dateColumns=['date'], floatColumns=['value'])
 
-        marketCap['date'] = pd.to_datetime(marketCap['date'])
         marketCap.sort_values(by='date', ascending=False, inplace=True)
         marketCap.set_index('date', inplace=True)
         marketCap.rename(columns={'value': 'marketcap'}, inplace=True)
@@ -428,19 +842,18 @@ class Company(object):
         return marketCap
 
     @staticmethod
-    def Dividend(security_id, verbose=False):
-        """" Returns the DataFrame with the provided security dividend.
+    def Dividend(security_id, verbose=False, api=None, start_date=None):
+        """" Returns the DataFrame with the provided security dividend (only since `start_date`, if it is provided).
         The date (in the returned DataFrame is the `record date` (not the pay date, nor declared date).
         """
 
-        api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
-
-        hdfs = api.HistoricalDataForSecurity(identifier=security_id, tag='dividend', page_size=10000)
+        if api is None:
+            api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
 
-        if len(hdfs['historical_data']) != 0:
-            dividend = pd.DataFrame(hdfs['historical_data'])
+        pages = api.Paginate('HistoricalDataForSecurity', security_id, 'dividend', **Company.BulkParams(start_date))
+        dividend, _ = Company.FrameFromPages(pages, 'historical_data', dateColumns=['date'], floatColumns=['value'])
 
-            dividend['date'] = pd.to_datetime(dividend['date'])
+        if len(dividend) != 0:
             dividend.sort_values(by='date', ascending=False, inplace=True)
             dividend.set_index('date', inplace=True)
             dividend.rename(columns={'value': 'dividend'}, inplace=True)
@@ -454,16 +867,18 @@ class Company(object):
         return dividend
 
     @staticmethod
-    def SharesOut(company_id, verbose=False):
-        """" https://data.intrinio.com/data-tag/weightedavedilutedsharesos """
-
-        api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
+    def SharesOut(company_id, verbose=False, api=None, start_date=None):
+        """" https://data.intrinio.com/data-tag/weightedavedilutedsharesos
+        (only since `start_date`, if it is provided)
+        """
 
-        hdfc = api.HistoricalDataForCompany(identifier=company_id, tag='weightedavedilutedsharesos', page_size=10000)
+        if api is None:
+            api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
 
-        sharesOut = pd.DataFrame(hdfc['historical_data'])
+        pages = api.Paginate('HistoricalDataForCompany', company_id, 'weightedavedilutedsharesos',
+                             **Company.BulkParams(start_date))
+        sharesOut, _ = Company.FrameFromPages(pages, 'historical_data', dateColumns=['date'], floatColumns=['value'])
 
-        sharesOut['date'] = pd.to_datetime(sharesOut['date'])
         sharesOut.sort_values(by='date', ascending=False, inplace=True)
         sharesOut.set_index('date', inplace=True)
         sharesOut.rename(columns={'value': 'sharesOut'}, inplace=True)
@@ -474,16 +889,16 @@ class Company(object):
         return sharesOut
 
     @staticmethod
-    def AdjustedClosePrice(company_id, verbose=False):
+    def AdjustedClosePrice(company_id, verbose=False, api=None):
         """ https://data.intrinio.com/data-tag/adj_close_price """
 
-        api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
-
-        hdfc = api.HistoricalDataForCompany(identifier=company_id, tag='adj_close_price', page_size=10000)
+        if api is None:
+            api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
 
-        adjustedClosePrice = pd.DataFrame(hdfc['historical_data'])
+        pages = api.Paginate('HistoricalDataForCompany', company_id, 'adj_close_price', page_size=10000)
+        adjustedClosePrice, _ = Company.FrameFromPages(pages, 'historical_data',
+                                                       dateColumns=['date'], floatColumns=['value'])
 
-        adjustedClosePrice['date'] = pd.to_datetime(adjustedClosePrice['date'])
         adjustedClosePrice.sort_values(by='date', ascending=False, inplace=True)
         adjustedClosePrice.set_index('date', inplace=True)
         adjustedClosePrice.rename(columns={'value': 'adjustedClosePrice'}, inplace=True)
@@ -493,6 +908,84 @@ class Company(object):
 
         return adjustedClosePrice
 
+    # Pagination
+    @staticmethod
+    def FrameFromPages(pages, key, dateColumns=(), floatColumns=()):
+        """ Builds DataFrame from the `key` records of the provided pages (see `IntrinioAPI.Paginate`) page by page,
+        i.e. while the next page is being downloaded. Returns the DataFrame and the first page (response metadata).
+
+        `dateColumns` are converted to datetime, with `CONFIG_PARSER['fast_decoding']` records are decoded
+        into typed columns (see `parser.decoder`) and `floatColumns` are converted to float64.
+        """
+
+        fastDecoding = CONFIG_PARSER['fast_decoding']
+
+        frames = []
+        firstPage = None
+
+        for page in pages:
+            if firstPage is None:
+                firstPage = page
+
+            if fastDecoding:
+                frames.append(decoder.Frame(page[key], dateColumns, floatColumns))
+            else:
+                frames.append(pd.DataFrame(page[key]))
+
+        if len(frames) == 1:
+            frame = frames[0]
+        else:
+            frame = pd.concat(frames, ignore_index=True)
+
+        if not fastDecoding:
+            for column in dateColumns:
+                if column in frame.columns:
+                    frame[column] = pd.to_datetime(frame[column])
+
+        if len(frame.columns) == 0:  # no records, e.g. nothing new since `start_date`
+            frame = pd.DataFrame(columns=list(dateColumns) + list(floatColumns))
+
+        return frame, firstPage
+
+    @staticmethod
+    def ExtendDated(old, new):
+        """ Returns `old` DataFrame (indexed by date in descending order) extended with `new` rows
+        (`new` values replace the old ones on the same dates).
+        """
+
+        if new is None or len(new) == 0:
+            return old
+        if old is None or len(old) == 0:
+            return new
+
+        extended = pd.concat([new, old[~old.index.isin(new.index)]])
+        extended.sort_index(ascending=False, inplace=True)
+
+        return extended
+
+    @staticmethod
+    def LastDate(dated):
+        """ Returns the last date of the DataFrame indexed by date (`None`, if it is empty). """
+
+        if dated is None or len(dated) == 0:
+            return None
+
+        return dated.index.max()
+
+    @staticmethod
+    def LengthDiff(new, old):
+        return (0 if new is None else len(new)) - (0 if old is None else len(old))
+
+    @staticmethod
+    def BulkParams(start_date=None):
+        """ Returns request parameters of bulk (prices, historical data) requests. """
+
+        params = {'page_size': 10000}
+        if start_date is not None:
+            params['start_date'] = pd.Timestamp(start_date).strftime('%Y-%m-%d')
+
+        return params
+
     # Filing Dates
     def FilingDatesClean(self):
         """ From restored filing dates:
@@ -503,9 +996,9 @@ class Company(object):
 
         fd = self.FilingDatesRaw()
 
-        idxBS = set(self.BS.index)
-        idxIS = set(self.IS.index)
-        idxCF = set(self.CF.index)
+        idxBS = set(self.FormObject('BS').index)
+        idxIS = set(self.FormObject('IS').index)
+        idxCF = set(self.FormObject('CF').index)
 
         idxALL = idxBS.intersection(idxIS, idxCF)
         idxALL = [idx for idx in idxALL if idx in fd.index]
@@ -515,24 +1008,64 @@ class Company(object):
 
         fd = fd.loc[idxALL, :].sort_values(by='end_date', ascending=False).copy()
 
-        config = CONFIG_PARSER['filing_dates'].copy()
-        low = config['end_interval']['low']
-        high = config['end_interval']['high']
-        expected = config['end_interval']['expected']
-
         fd['diff'] = (fd['end_date'].shift(1) - fd['end_date']).dt.days
         assertionText = '{}: More then 1 missing dates diff.'.format(self.company_id)
         assert fd['diff'].isnull().sum() == 1, assertionText
-        fd['diff'] = fd['diff'].fillna(expected)
 
-        while not fd['diff'].between(low, high).all():
-            rowsToSave = fd[fd['diff'].between(low, high)].index.tolist()
-            fd = fd.loc[rowsToSave, :]
+        fdClean = Company.PruneEndDateGaps(fd.drop(columns='diff'))
 
-            fd['diff'] = (fd['end_date'].shift(1) - fd['end_date']).dt.days
-            fd['diff'] = fd['diff'].fillna(expected)
+        return fdClean
 
-        fdClean = fd.drop(columns='diff')
+    @staticmethod
+    def PruneEndDateGaps(fd, level=None):
+        """ Returns `fd` (sorted by `end_date` in descending order) without the filings, which are too far from
+        (or too close to) the preceding (later) filing according to `end_interval`. Rows which break the interval
+        are removed simultaneously, after that the intervals are recomputed between the remaining rows, until all of
+        them are within `end_interval` (the latest filing is compared with `expected` interval).
+
+        Linear time: after every round only the rows, which lost their preceding row, are checked again.
+        If `level` is provided, `fd` is processed as a stack of many companies' filing dates: rows are grouped
+        by the index level (e.g. `company_id` of MultiIndex), groups should be contiguous.
+        """
+
+        config = CONFIG_PARSER['filing_dates']['end_interval']
+        low, high, expected = config['low'], config['high'], config['expected']
+
+        n = len(fd)
+        endDates = fd['end_date'].values.astype('datetime64[ns]').astype(np.int64).tolist()
+        day = 24 * 60 * 60 * 10 ** 9
+
+        # doubly linked list of the remaining rows, groups are not linked with each other
+        prev = list(range(-1, n - 1))
+        nxt = list(range(1, n + 1))
+        if level is not None:
+            groups = fd.index.get_level_values(level)
+            for i in np.flatnonzero(groups[1:] != groups[:-1]) + 1:
+                prev[i] = -1
+                nxt[i - 1] = n
+
+        keep = np.ones(n, dtype=bool)
+        toCheck = range(n)
+
+        while len(toCheck) > 0:
+            removed = []
+            for i in toCheck:
+                diff = expected if prev[i] == -1 else (endDates[prev[i]] - endDates[i]) // day
+                if not low <= diff <= high:
+                    removed.append(i)
+
+            changed = set()
+            for i in removed:
+                keep[i] = False
+                if prev[i] != -1:
+                    nxt[prev[i]] = nxt[i]
+                if nxt[i] != n:
+                    prev[nxt[i]] = prev[i]
+                    changed.add(nxt[i])
+
+            toCheck = sorted(i for i in changed if keep[i])
+
+        fdClean = fd[keep]
 
         return fdClean
 
@@ -548,15 +1081,18 @@ class Company(object):
         rflBS['delay'] = (rflBS['filing_date'] - rflBS['end_date']).dt.total_seconds() / (60 * 60 * 24)
 
         cols = ['end_date', 'filing_date', 'delay']
-        rowsQ = rflBS[rflBS['fiscal_period'] != 'FY'].index
-        rowsY = rflBS[rflBS['fiscal_period'] == 'FY'].index
+        isY = (rflBS['fiscal_period'] == 'FY').values
+        rowsQ = rflBS[~isY].index
+        rowsY = rflBS[isY].index
+
+        # quarters and FYs are matched separately
+        rflBS['period'] = np.where(isY, 'Y', 'Q')
+        filingDates = Company.ExtractFilingDates(rflBS, by='period').values
 
         # Quarters
         fdQ = rflBS.loc[rowsQ, cols].copy()
 
-        fdSeries = fdQ['filing_date']
-        edSeries = fdQ['end_date']
-        fdQ['filing_date'] = [Company.ExtractFilingDate(end_date, fdSeries) for end_date in edSeries]
+        fdQ['filing_date'] = filingDates[~isY]
         fdQ['delay'] = (fdQ['filing_date'] - fdQ['end_date']).dt.total_seconds() / (60 * 60 * 24)
 
         minQ = fdQ['delay'].min()
@@ -572,9 +1108,7 @@ class Company(object):
         # FYs
         fdY = rflBS.loc[rowsY, cols].copy()
 
-        fdSeries = fdY['filing_date']
-        edSeries = fdY['end_date']
-        fdY['filing_date'] = [Company.ExtractFilingDate(end_date, fdSeries) for end_date in edSeries]
+        fdY['filing_date'] = filingDates[isY]
         fdY['delay'] = (fdY['filing_date'] - fdY['end_date']).dt.total_seconds() / (60 * 60 * 24)
 
         minY = fdY['delay'].min()
@@ -651,6 +1185,44 @@ class Company(object):
 
         return fd
 
+    @staticmethod
+    def ExtractFilingDates(rfl, by=None):
+        """ Vectorized `ExtractFilingDate` (as-of join of sorted dates): for every row of `rfl` returns the earliest
+        `filing_date` among the rows of the same `by` group(s) within `borders` after the row's `end_date`
+        (NaT if there is no such filing date). Returns Series aligned with `rfl`.
+
+        `rfl` could be a stacked list of many companies' filings, e.g. with `by=['company_id', 'period']`.
+        """
+
+        low = CONFIG_PARSER['filing_dates']['borders']['low']
+        high = CONFIG_PARSER['filing_dates']['borders']['high']
+
+        if by is None:
+            by = []
+        elif isinstance(by, str):
+            by = [by]
+
+        left = pd.DataFrame({'key': (rfl['end_date'] + pd.to_timedelta(low, 'days')).values,
+                             'position': np.arange(len(rfl))})
+        right = pd.DataFrame({'key': rfl['filing_date'].values, 'match': rfl['filing_date'].values})
+        for column in by:
+            left[column] = rfl[column].values
+            right[column] = rfl[column].values
+
+        left = left.dropna(subset=['key']).sort_values(by='key', kind='mergesort')
+        right = right.dropna(subset=['key']).sort_values(by='key', kind='mergesort')
+
+        matched = pd.merge_asof(left, right, on='key', by=by if by else None, direction='forward')
+
+        filingDates = np.full(len(rfl), np.datetime64('NaT'), dtype='datetime64[ns]')
+        filingDates[matched['position'].values] = matched['match'].values
+        filingDates = pd.Series(filingDates, index=rfl.index)
+
+        diff = (filingDates - rfl['end_date']).dt.total_seconds() / (60 * 60 * 24)
+        filingDates[~((low <= diff) & (diff <= high))] = pd.NaT
+
+        return filingDates
+
 
 class DummyCompany(object):
 
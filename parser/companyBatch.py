@@ -0,0 +1,76 @@
+from ..technical.config import CONFIG_PARSER
+from ..parser.company import Company
+# --------------------------------------------
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+BATCH = CONFIG_PARSER['batch']
+
+
+class CompanyBatch(object):
+    """ Builds many companies on shared bounded thread pools:
+        --- `companies` - number of companies built concurrently (every one waits for its stages);
+        --- `stageWorkers` - threads for initialization stages of all companies (stages wait for requests);
+        --- `requestWorkers` - threads for requests made within the stages (they never wait for other tasks),
+    hence the pools can't deadlock and the throughput is limited by the API rate limiter.
+
+    Iterating over the batch yields (company_id, company, error) tuples in completion order:
+    `error` is the exception raised by the company's build (`company` is `None` then), failures are also
+    collected to `failures` dict. `companyKwargs` are passed to `Company` (e.g. `compact=True`).
+
+        for company_id, company, error in CompanyBatch(company_id_list):
+            ...
+    """
+
+    def __init__(self, company_id_list, companies=BATCH['companies'], stageWorkers=BATCH['stage_workers'],
+                 requestWorkers=BATCH['request_workers'], verbose=False, **companyKwargs):
+        self.company_id_list = list(company_id_list)
+        self.companies = companies
+        self.stageWorkers = stageWorkers
+        self.requestWorkers = requestWorkers
+        self.verbose = verbose
+        self.companyKwargs = companyKwargs
+
+        self.failures = {}
+
+    def __len__(self):
+        return len(self.company_id_list)
+
+    def __iter__(self):
+        builders = ThreadPoolExecutor(max_workers=self.companies)
+        stageExecutor = ThreadPoolExecutor(max_workers=self.stageWorkers)
+        requestExecutor = ThreadPoolExecutor(max_workers=self.requestWorkers)
+
+        company_ids = iter(self.company_id_list)
+        running = {}
+
+        def Submit():
+            company_id = next(company_ids, None)
+            if company_id is not None:
+                future = builders.submit(Company, company_id, executor=stageExecutor, requestExecutor=requestExecutor,
+                                         **self.companyKwargs)
+                running[future] = company_id
+
+        try:
+            for _ in range(self.companies):
+                Submit()
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    company_id = running.pop(future)
+                    Submit()
+
+                    error = future.exception()
+                    if error is None:
+                        yield company_id, future.result(), None
+                    else:
+                        self.failures[company_id] = error
+                        if self.verbose:
+                            print('{}: build failed ({}: {}).'.format(company_id, type(error).__name__, error))
+                        yield company_id, None, error
+        finally:
+            for future in running:
+                future.cancel()
+            builders.shutdown(wait=True)
+            stageExecutor.shutdown(wait=True)
+            requestExecutor.shutdown(wait=True)
@@ -0,0 +1,75 @@
+import pandas as pd
+import numpy as np
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def Loads(content):
+    """ Decodes JSON (bytes or str), uses `orjson` if it is installed. """
+
+    if orjson is not None:
+        d = orjson.loads(content)
+    else:
+        d = json.loads(content)
+
+    return d
+
+
+def Frame(records, dateColumns=(), floatColumns=()):
+    """ Returns DataFrame built from the list of dicts column by column (without row-wise DataFrame construction):
+        --- `dateColumns` are parsed into `datetime64[ns]`;
+        --- `floatColumns` are converted to `float64` (`None` becomes NaN);
+        --- other columns get the same dtypes as with `pd.DataFrame(records)`.
+    """
+
+    if len(records) == 0:
+        return pd.DataFrame()
+
+    # records of a response are usually homogeneous, the union of keys is collected only if they are not
+    keys = records[0].keys()
+    columns = list(keys)
+    if any(record.keys() != keys for record in records):
+        columns = list(dict.fromkeys(key for record in records for key in record))
+
+    data = {}
+    for column in columns:
+        values = [record.get(column) for record in records]
+
+        if column in dateColumns:
+            data[column] = DateColumn(values)
+        elif column in floatColumns:
+            data[column] = np.array(values, dtype=np.float64)
+        else:
+            data[column] = InferredColumn(values)
+
+    frame = pd.DataFrame(data, columns=columns, copy=False)
+
+    return frame
+
+
+def DateColumn(values):
+    """ Parses ISO dates (e.g. '2019-12-31') with numpy, other formats are passed to `pd.to_datetime`. """
+
+    try:
+        column = np.array(values, dtype='datetime64[D]').astype('datetime64[ns]')
+    except ValueError:
+        column = pd.to_datetime(pd.Series(values)).values
+
+    return column
+
+
+def InferredColumn(values):
+    """ Returns numpy array for homogeneous numeric / boolean / string values, other values are inferred by pandas. """
+
+    if isinstance(values[0], str):
+        column = np.array(values, dtype=object)
+    else:
+        column = np.array(values)
+        if column.dtype.kind not in 'biuf':
+            column = pd.Series(values)
+
+    return column
@@ -0,0 +1,224 @@
+import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class Screener(object):
+    """ Indexed read-only copy of companies / securities DataFrame for fast repeated screens:
+        --- object columns are typed (low-cardinality strings become categorical, dates - `datetime64`,
+        flags - nullable booleans, numbers - numeric);
+        --- categorical / boolean columns are indexed by value (rows of every value),
+        date / numeric columns - by sorted order (range lookups are binary searches).
+
+    Filters of `Query` / `Mask` / `Ids` are provided by column name:
+        --- scalar - equality (e.g. `sector='Technology'`, `active=True`);
+        --- list / set - membership (e.g. `sic=['6021', '6022']`);
+        --- tuple (low, high) - inclusive range, `None` is an open bound
+        (e.g. `first_stock_price_date=(None, '2010-01-01')`); missing values never match.
+
+        screener = Screener(universe.companies)
+        screener.Query(columns=['ticker', 'name'], sector='Technology', last_fundamental_date=('2019-12-31', None))
+
+    `Save` / `Load` persist the typed frame to a columnar file (Feather, or Parquet by extension, requires `pyarrow`).
+    """
+
+    def __init__(self, frame):
+        self.frame = Screener.Typed(frame)
+        if 'id' in self.frame:
+            self.frame.index = self.frame['id'].values
+
+        self.groups = {}
+        self.sorted = {}
+        for column in self.frame:
+            values = self.frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(values.dtype):
+                self.groups[column] = Screener.Groups(values)
+            elif pd.api.types.is_datetime64_any_dtype(values.dtype) or pd.api.types.is_numeric_dtype(values.dtype):
+                self.sorted[column] = Screener.Sorted(values)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def Query(self, columns=None, **filters):
+        """ Returns the rows (`columns` only, if provided), which match all the filters. """
+
+        rows = np.flatnonzero(self.Mask(**filters))
+
+        frame = self.frame.take(rows)
+
+        return frame if columns is None else frame[columns]
+
+    def Ids(self, **filters):
+        """ Returns index values (ids) of the rows, which match all the filters. """
+
+        return self.frame.index[self.Mask(**filters)]
+
+    def Mask(self, **filters):
+        """ Returns boolean mask of the rows, which match all the filters. """
+
+        mask = np.ones(len(self.frame), dtype=bool)
+        for column, condition in filters.items():
+            assertionText = '{}: unknown column.'.format(column)
+            assert column in self.frame, assertionText
+
+            mask &= self.ColumnMask(column, condition)
+
+        return mask
+
+    def ColumnMask(self, column, condition):
+        n = len(self.frame)
+
+        if column in self.groups:
+            assertionText = '{}: ranges are not supported by categorical columns.'.format(column)
+            assert not isinstance(condition, tuple), assertionText
+
+            groups = self.groups[column]
+            values = condition if isinstance(condition, (list, set, frozenset)) else [condition]
+
+            mask = np.zeros(n, dtype=bool)
+            for value in values:
+                rows = groups.get(value)
+                if rows is not None:
+                    mask[rows] = True
+
+        elif column in self.sorted:
+            order, sortedValues = self.sorted[column]
+            if isinstance(condition, tuple):
+                ranges = [condition]
+            elif isinstance(condition, (list, set, frozenset)):
+                ranges = [(value, value) for value in condition]
+            else:
+                ranges = [(condition, condition)]
+
+            mask = np.zeros(n, dtype=bool)
+            for low, high in ranges:
+                start = 0
+                if low is not None:
+                    start = np.searchsorted(sortedValues, Screener.Key(low, sortedValues), 'left')
+                end = len(order)
+                if high is not None:
+                    end = np.searchsorted(sortedValues, Screener.Key(high, sortedValues), 'right')
+                mask[order[start:end]] = True
+
+        else:
+            values = self.frame[column]
+            if isinstance(condition, tuple):
+                low, high = condition
+                mask = values.notna().values
+                if low is not None:
+                    mask &= (values >= low).values
+                if high is not None:
+                    mask &= (values <= high).values
+            elif isinstance(condition, (list, set, frozenset)):
+                mask = values.isin(condition).values
+            else:
+                mask = (values == condition).values
+
+        return mask
+
+    # Persistence
+    def Save(self, path):
+        """ Saves the typed frame to Feather file (Parquet, if `path` ends with '.parquet'). """
+
+        Screener.CheckPyarrow()
+
+        frame = self.frame.reset_index(drop=True)
+        if str(path).endswith('.parquet'):
+            frame.to_parquet(path)
+        else:
+            frame.to_feather(path)
+
+    @staticmethod
+    def Load(path):
+        """ Returns `Screener` loaded from Feather / Parquet file (consider `Save`). """
+
+        Screener.CheckPyarrow()
+
+        if str(path).endswith('.parquet'):
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_feather(path)
+
+        return Screener(frame)
+
+    @staticmethod
+    def CheckPyarrow():
+        if pyarrow is None:
+            raise Exception('`pyarrow` is required to save / load screeners.')
+
+    # Indexes
+    @staticmethod
+    def Groups(values):
+        """ Returns {value: rows array} dict (missing values are not indexed). """
+
+        codes, uniques = pd.factorize(values)
+
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        groups = {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)}
+
+        return groups
+
+    @staticmethod
+    def Sorted(values):
+        """ Returns (rows, values) arrays of the presented values in ascending order. """
+
+        presented = np.flatnonzero(values.notna().values)
+        array = values.values[presented]
+
+        order = presented[np.argsort(array, kind='stable')]
+        sortedValues = values.values[order]
+
+        return order, sortedValues
+
+    @staticmethod
+    def Key(value, sortedValues):
+        """ Converts the filter's bound to the type of the indexed values (e.g. date strings to `datetime64`). """
+
+        if sortedValues.dtype.kind == 'M':
+            return pd.Timestamp(value).to_datetime64()
+
+        return value
+
+    # Typing
+    @staticmethod
+    def Typed(frame, categoricalShare=0.5):
+        """ Returns copy of the frame with typed object columns, strings become categorical, if the number of
+        distinct values is not more than `categoricalShare` of the rows.
+        """
+
+        typed = frame.copy()
+        for column in frame:
+            if frame[column].dtype == object:
+                typed[column] = Screener.TypedColumn(frame[column], categoricalShare)
+
+        return typed
+
+    @staticmethod
+    def TypedColumn(values, categoricalShare):
+        kind = pd.api.types.infer_dtype(values, skipna=True)
+
+        if kind == 'empty':
+            return values
+
+        if kind == 'boolean':
+            return values.astype('boolean')
+
+        if kind in ['datetime', 'datetime64', 'date']:
+            return pd.to_datetime(values)
+
+        if kind in ['integer', 'floating', 'mixed-integer-float', 'decimal']:
+            return pd.to_numeric(values)
+
+        if kind != 'string':
+            values = values.where(values.isna(), values.astype(str))
+
+        if values.nunique() <= categoricalShare * len(values):
+            return values.astype('category')
+
+        return values
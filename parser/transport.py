@@ -0,0 +1,77 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+import requests
+from requests.adapters import HTTPAdapter
+
+import threading
+
+# keep-alive connections per host, enough for the largest number of concurrent requests:
+# stages and requests of `CompanyBatch`, `Universe` pipeline, a `Company` (its stages' pool
+# and the pools of its reporting forms and securities)
+defaultPoolSize = max(
+    CONFIG_PARSER['batch']['stage_workers'] + CONFIG_PARSER['batch']['request_workers'],
+    CONFIG_PARSER['universe_pipeline']['workers'],
+    CONFIG_PARSER['processes'] * 5,
+)
+
+
+class PooledTransport(object):
+    """ Keep-alive HTTP transport: a single `requests.Session` with a connection pool,
+    which is shared by all threads (consider `defaultPoolSize`, connections over the pool size
+    are not kept alive).
+
+    Any object with `Get(url, params, timeout)` method returning `requests.Response`
+    could be passed to `IntrinioAPI` as a transport.
+    """
+
+    headers = {
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    }
+
+    def __init__(self, poolSize=defaultPoolSize):
+        self.poolSize = poolSize
+        self.session = None
+        self.lock = threading.Lock()
+
+    def Session(self):
+        """ Returns the session (creates it on the first call). """
+
+        if self.session is None:
+            with self.lock:
+                if self.session is None:
+                    self.session = PooledTransport.CreateSession(self.poolSize)
+
+        return self.session
+
+    def Get(self, url, params, timeout):
+        """ Sends GET request through the pooled session, returns `requests.Response`. """
+
+        r = self.Session().get(url, params=params, timeout=timeout)
+
+        return r
+
+    def Close(self):
+        """ Closes all pooled connections. """
+
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    @staticmethod
+    def CreateSession(poolSize):
+        """ Returns `requests.Session` with `poolSize` keep-alive connections per host. """
+
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=poolSize)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(PooledTransport.headers)
+
+        return session
+
+
+DEFAULT_TRANSPORT = PooledTransport()
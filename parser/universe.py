@@ -1,101 +1,572 @@
 from ..technical.config import CONFIG_PARSER
 from ..parser.api import IntrinioAPI
-from ..parser.company import Company
+from ..parser.company import Company, COMPANY_DATES, SECURITY_DATES
+from ..parser.companyBatch import CompanyBatch
+from ..parser.screener import Screener
+from ..technical.singleFlight import SingleFlight
+from ..technical.checkpoint import Checkpoint
 # --------------------------------------------
 import pandas as pd
+import numpy as np
 import multiprocessing.dummy as multiprocessing
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from functools import partial
 from tqdm import tqdm
+import zipfile
+
+PIPELINE = CONFIG_PARSER['universe_pipeline']
+
+COMPANIES_LIST_COLUMNS = ['id', 'ticker', 'name', 'lei', 'cik']  # fields of `AllCompanies` response
+
+# identifiers are kept as strings (e.g. leading zeros of `cik`)
+BULK_STRING_COLUMNS = [
+    'id',
+    'company_id',
+    'ticker',
+    'composite_ticker',
+    'name',
+    'lei',
+    'cik',
+    'sic',
+    'figi',
+    'composite_figi',
+    'share_class_figi',
+]
 
 
 class Universe(object):
 
-    def __init__(self):
+    def __init__(self, memo=None, companiesFile=None, securitiesFile=None, checkpoint=None,
+                 pipeline=PIPELINE['enabled']):
+        """ `memo` - `technical.singleFlight.SingleFlight` instance, pass the same instance to `Company`
+        to reuse responses collected by `Universe` (e.g. companies' securities).
+        `companiesFile` / `securitiesFile` - bulk CSV exports (plain, compressed or ZIP archives) with one row
+        per company / security (fields of `LookupCompany` / `LookupSecurity` responses), if provided
+        the respective data is read from the file instead of per-company / per-security requests.
+        `checkpoint` - directory (or `technical.checkpoint.Checkpoint` instance), where the collected companies
+        and securities are saved during the crawl: a crawl with the same `checkpoint` resumes from it
+        (unless it is older than `CONFIG_PARSER['checkpoint']['max_age']`).
+        Items, which failed (after all retries), are collected to `failures` (consider `RetryFailures`).
+        `pipeline` - companies, securities lists and securities are requested concurrently (consider `Pipeline`),
+        if they are not read from the bulk files.
+        """
+
+        if memo is None:
+            memo = SingleFlight()
+        api = IntrinioAPI(memo=memo)
+        checkpoint = Universe.CheckpointOf(checkpoint)
+
+        self.failures = {'companies': {}, 'securitiesList': {}, 'securities': {}}
+        self.screeners = {}
+        self.refreshDate = pd.Timestamp.today().normalize()  # start of the last crawl (consider `Refresh`)
+        if checkpoint is not None:  # the crawl could be resumed from an earlier one
+            self.refreshDate = pd.Timestamp.fromtimestamp(checkpoint.created).normalize()
+
+        pipelined = pipeline and companiesFile is None and securitiesFile is None
+
+        if companiesFile is None:
+            self.companiesList = Universe.CompaniesList(checkpoint=checkpoint)
+            self.company_id_list = self.companiesList['id'].tolist()
+            if not pipelined:
+                self.companies = Universe.Companies(self.company_id_list, api=api, checkpoint=checkpoint,
+                                                    failures=self.failures['companies'])
+        else:
+            self.companies = Universe.CompaniesFromFile(companiesFile)
+            columns = [column for column in COMPANIES_LIST_COLUMNS if column in self.companies]
+            self.companiesList = self.companies[columns].reset_index(drop=True)
+            self.company_id_list = self.companiesList['id'].tolist()
+
+        if pipelined:
+            self.companies, self.securitiesList, self.securities = Universe.Pipeline(
+                self.company_id_list, api=api, checkpoint=checkpoint, failures=self.failures)
+            self.security_id_list = self.securitiesList['id'].tolist() if len(self.securitiesList) else []
+        elif securitiesFile is None:
+            self.securitiesList = Universe.SecuritiesList(self.company_id_list, api=api, checkpoint=checkpoint,
+                                                          failures=self.failures['securitiesList'])
+            self.security_id_list = self.securitiesList['id'].tolist() if len(self.securitiesList) else []
+            self.securities = Universe.Securities(self.security_id_list, api=api, checkpoint=checkpoint,
+                                                  failures=self.failures['securities'])
+        else:
+            self.securities = Universe.SecuritiesFromFile(securitiesFile, self.company_id_list)
+            self.securitiesList = self.securities.reset_index(drop=True)
+            self.security_id_list = self.securitiesList['id'].tolist()
+
+    def RetryFailures(self, memo=None, checkpoint=None):
+        """ Requests the failed items (consider `failures`) again and merges the collected data into the universe,
+        items, which failed again, are kept in `failures`. Returns the number of the remaining failures.
+        """
+
+        if memo is None:
+            memo = SingleFlight()
+        api = IntrinioAPI(memo=memo)
+        checkpoint = Universe.CheckpointOf(checkpoint)
+
+        company_id_list = list(self.failures['companies'])
+        if company_id_list:
+            self.failures['companies'] = {}
+            companies = Universe.Companies(company_id_list, api=api, checkpoint=checkpoint,
+                                           failures=self.failures['companies'])
+            self.companies = pd.concat([self.companies, companies])
+
+        company_id_list = list(self.failures['securitiesList'])
+        security_id_list = list(self.failures['securities'])
+        if company_id_list:
+            self.failures['securitiesList'] = {}
+            securitiesList = Universe.SecuritiesList(company_id_list, api=api, checkpoint=checkpoint,
+                                                     failures=self.failures['securitiesList'])
+            if len(securitiesList):
+                self.securitiesList = pd.concat([self.securitiesList, securitiesList])
+                self.security_id_list += securitiesList['id'].tolist()
+                security_id_list += securitiesList['id'].tolist()
+
+        if security_id_list:
+            self.failures['securities'] = {}
+            securities = Universe.Securities(security_id_list, api=api, checkpoint=checkpoint,
+                                             failures=self.failures['securities'])
+            self.securities = pd.concat([self.securities, securities])
+
+        self.screeners = {}
+
+        return sum(len(failures) for failures in self.failures.values())
+
+    def Refresh(self, memo=None, since=None):
+        """ Updates the universe in place, companies are collected again (with their securities), if they are:
+            --- new (not collected yet, e.g. failed or listed after the last crawl);
+            --- filed reporting forms on or after `since` (`refreshDate` by default), requested with
+            `latest_filing_date` filter of the companies list;
+            --- listed with stock prices, but the stored company has no `last_stock_price_date`.
+        Companies, which are not listed anymore, are removed. Returns the list of the refreshed companies.
+        Dates of the companies, which are not refreshed, are kept as of their last collection
+        (e.g. `last_stock_price_date` of the trading companies).
+        """
+
+        if memo is None:
+            memo = SingleFlight()
+        api = IntrinioAPI(memo=memo)
+
+        if since is None:
+            since = self.refreshDate
+        refreshDate = pd.Timestamp.today().normalize()
+
+        companiesList = Universe.CompaniesList()
+        company_id_list = companiesList['id'].tolist()
+
+        filedList = Universe.CompaniesList(latest_filing_date=pd.Timestamp(since).strftime('%Y-%m-%d'))
+        filed = filedList['id'].tolist() if len(filedList) else []
+
+        changed = Universe.ChangedCompanies(companiesList, self.companies, filed)
+
+        failures = {'companies': {}, 'securitiesList': {}, 'securities': {}}
+        companies = Universe.Companies(changed, api=api, failures=failures['companies'])
+        securitiesList = Universe.SecuritiesList(changed, api=api, failures=failures['securitiesList'])
+        security_id_list = securitiesList['id'].tolist() if len(securitiesList) else []
+        securities = Universe.Securities(security_id_list, api=api, failures=failures['securities'])
+
+        # stored data of the failed companies is kept (unless they are not listed anymore)
+        listed = set(company_id_list)
+        replaced = set(changed) - set(failures['securitiesList'])
+
+        keep = self.companies.index.isin(listed - set(companies.index))
+        self.companies = pd.concat([self.companies[keep], companies])
+        self.companies = self.companies.loc[[i for i in company_id_list if i in self.companies.index]]
+
+        keep = Universe.OfCompanies(self.securitiesList, listed - replaced)
+        self.securitiesList = pd.concat([self.securitiesList[keep], securitiesList])
+        self.security_id_list = self.securitiesList['id'].tolist() if len(self.securitiesList) else []
+
+        keep = Universe.OfCompanies(self.securities, listed - replaced)
+        self.securities = pd.concat([self.securities[keep], securities])
+
+        self.companiesList = companiesList
+        self.company_id_list = company_id_list
+
+        # failures of the refreshed (or not listed anymore) items are replaced with the new ones
+        refreshed = {'companies': set(changed), 'securitiesList': set(changed), 'securities': set(security_id_list)}
+        current = {'companies': listed, 'securitiesList': listed, 'securities': set(self.security_id_list)}
+        for stage, stageFailures in failures.items():
+            kept = {i: errorText for i, errorText in self.failures[stage].items()
+                    if i in current[stage] and i not in refreshed[stage]}
+            self.failures[stage] = {**kept, **stageFailures}
+
+        self.screeners = {}
+        self.refreshDate = refreshDate
+
+        return changed
+
+    @staticmethod
+    def ChangedCompanies(companiesList, companies, filed=()):
+        """ Returns ids of the listed companies (in the list's order), which should be collected again:
+        new ones (not in `companies` DataFrame indexed by id), `filed` ones and the stored ones without
+        `last_stock_price_date` (companies are listed with stock prices only).
+        """
 
-        self.companiesList = Universe.CompaniesList()
-        self.company_id_list = self.companiesList['id'].tolist()
-        self.companies = Universe.Companies(self.company_id_list)
+        listed = pd.Index(companiesList['id'])
 
-        self.securitiesList = Universe.SecuritiesList(self.company_id_list)
-        self.security_id_list = self.securitiesList['id'].tolist()
-        self.securities = Universe.Securities(self.security_id_list)
+        changed = ~listed.isin(companies.index) | listed.isin(list(filed))
+        if 'last_stock_price_date' in companies:
+            stored = companies['last_stock_price_date'].reindex(listed)
+            changed |= listed.isin(companies.index) & stored.isna().values
+
+        return listed[changed].tolist()
 
     @staticmethod
-    def CompaniesList():
-        """ Returns all companies DataFrame. """
+    def OfCompanies(securities, company_id_set):
+        """ Returns boolean mask of the securities, which belong to the provided companies. """
+
+        if len(securities) == 0:
+            return np.zeros(0, dtype=bool)
+
+        return securities['company_id'].isin(company_id_set).values
+
+    def Screener(self, table='companies'):
+        """ Returns `parser.screener.Screener` of `companies` or `securities` (built once, until the universe
+        is updated), consider `Screener.Save` / `Screener.Load` to persist it.
+        """
+
+        assertionText = '{}: unknown table, use `companies` or `securities`.'.format(table)
+        assert table in ['companies', 'securities'], assertionText
+
+        if table not in self.screeners:
+            self.screeners[table] = Screener(getattr(self, table))
+
+        return self.screeners[table]
+
+    def Query(self, table='companies', columns=None, **filters):
+        """ Returns rows of `companies` or `securities`, which match all the filters
+        (consider `parser.screener.Screener`), e.g. `universe.Query(sector='Technology', columns=['ticker'])`.
+        """
+
+        return self.Screener(table).Query(columns=columns, **filters)
+
+    def BuildCompanies(self, company_id_list=None, **kwargs):
+        """ Returns `parser.companyBatch.CompanyBatch` for the provided companies (all companies by default),
+        iterating over it yields (company_id, company, error) tuples in completion order.
+        """
+
+        if company_id_list is None:
+            company_id_list = self.company_id_list
+
+        return CompanyBatch(company_id_list, **kwargs)
+
+    @staticmethod
+    def CompaniesList(checkpoint=None, **params):
+        """ Returns all companies DataFrame (saved to / loaded from `checkpoint`, if provided),
+        `params` - additional filters of `AllCompanies` request (e.g. `latest_filing_date='2020-01-31'`).
+        """
+
+        if checkpoint is not None:
+            done, _ = checkpoint.Load('companiesList')
+            if 'companiesList' in done:
+                return done['companiesList']
 
         params = {
             'has_fundamentals': 'True',
             'has_stock_prices': 'True',
-            'page_size': '10000'
+            'page_size': '10000',
+            **params
         }
 
         api = IntrinioAPI(timeout=CONFIG_PARSER['timeout_bulk'])
 
-        acom = api.AllCompanies(**params)
+        pages = api.Paginate('AllCompanies', **params)
+        companiesList, _ = Company.FrameFromPages(pages, 'companies')
 
-        acomCompanies = acom['companies']
-        acomNextPage = acom['next_page']
+        if checkpoint is not None:
+            checkpoint.Save('companiesList', 'companiesList', companiesList)
+            checkpoint.Close()
 
-        while acomNextPage is not None:
+        return companiesList
 
-            params['next_page'] = acomNextPage
+    @staticmethod
+    def Companies(company_id_list, api=None, checkpoint=None, failures=None):
+        """ Returns all companies DataFrame (consider `Crawl` for `checkpoint` and `failures`). """
 
-            acomNextPart = api.AllCompanies(**params)
+        ci_dict = Universe.Crawl(partial(Company.CompanyInfo, api=api), company_id_list, 'companies',
+                                 checkpoint, failures)
 
-            acomCompanies += acomNextPart['companies']
-            acomNextPage = acomNextPart['next_page']
+        companies = Universe.Concat(ci_dict, company_id_list, rows=True)
 
-        companiesList = pd.DataFrame(acomCompanies)
+        return companies
 
-        return companiesList
+    @staticmethod
+    def SecuritiesList(company_id_list, api=None, checkpoint=None, failures=None):
+        """ Returns all securities DataFrame (consider `Crawl` for `checkpoint` and `failures`). """
+
+        sl_dict = Universe.Crawl(partial(Company.SecuritiesList, api=api), company_id_list, 'securitiesList',
+                                 checkpoint, failures)
+
+        securitiesList = Universe.Concat(sl_dict, company_id_list)
+
+        return securitiesList
+
+    @staticmethod
+    def Securities(security_id_list, api=None, checkpoint=None, failures=None):
+        """ Returns the list of all securities with general information about them (in DataFrame format),
+        consider `Crawl` for `checkpoint` and `failures`.
+        """
+
+        si_dict = Universe.Crawl(partial(Company.SecurityInfo, api=api), security_id_list, 'securities',
+                                 checkpoint, failures)
+
+        securities = Universe.Concat(si_dict, security_id_list, rows=True)
+
+        return securities
 
     @staticmethod
-    def Companies(company_id_list):
-        """ Returns all companies DataFrame. """
+    def Crawl(function, id_list, stage, checkpoint=None, failures=None):
+        """ Returns {id: function(id)} dict for the provided ids (requested on the thread pool):
+            --- `checkpoint` - `technical.checkpoint.Checkpoint`, ids completed in the `stage` are loaded from it
+            (not requested again), new results and failures are saved as soon as they are collected;
+            --- `failures` - dict, which collects {id: error text} of the failed ids
+            (if not provided, the exception is raised).
+        """
+
+        results = {}
+        if checkpoint is not None:
+            done, _ = checkpoint.Load(stage)
+            results = {i: done[i] for i in id_list if i in done}
+
+        def Item(i):
+            try:
+                return i, function(i), None
+            except Exception as error:
+                if failures is None:
+                    raise
+                return i, None, '{}: {}'.format(type(error).__name__, error)
 
         pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
 
-        ci_list = []
-        for ci in tqdm(pool.imap(Company.CompanyInfo, company_id_list), total=len(company_id_list)):
-            ci_list.append(ci)
+        toDo = [i for i in id_list if i not in results]
+        for i, result, errorText in tqdm(pool.imap(Item, toDo), total=len(toDo)):
+            if errorText is None:
+                results[i] = result
+                if checkpoint is not None:
+                    checkpoint.Save(stage, i, result)
+            else:
+                failures[i] = errorText
+                if checkpoint is not None:
+                    checkpoint.Fail(stage, i, errorText)
 
         pool.close()
         pool.join()
 
-        companies = pd.concat(ci_list, axis=1).T
+        if checkpoint is not None:
+            checkpoint.Close()
 
-        return companies
+        return results
 
     @staticmethod
-    def SecuritiesList(company_id_list):
-        """ Returns all securities DataFrame. """
+    def Pipeline(company_id_list, api=None, checkpoint=None, failures=None, workers=PIPELINE['workers'],
+                 queueSize=PIPELINE['queue_size']):
+        """ Returns (companies, securitiesList, securities) DataFrames of the provided companies
+        (as `Companies`, `SecuritiesList` and `Securities` do), but the stages are not executed one after another:
+        requests of all stages share `workers` threads, securities are requested as soon as their company's
+        securities list is collected. Securities' requests are preferred and securities lists are requested
+        only if less than `queueSize` securities wait for their requests (backpressure).
+        `checkpoint` and `failures` (dict of dicts by stage) are treated as in `Crawl`.
+        """
+
+        functions = {
+            'companies': partial(Company.CompanyInfo, api=api),
+            'securitiesList': partial(Company.SecuritiesList, api=api),
+            'securities': partial(Company.SecurityInfo, api=api),
+        }
+        stages = list(functions)
 
-        pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
+        results = {stage: {} for stage in stages}
+        if checkpoint is not None:
+            for stage in stages:
+                results[stage], _ = checkpoint.Load(stage)
 
-        sl_list = []
-        for sl in tqdm(pool.imap(Company.SecuritiesList, company_id_list), total=len(company_id_list)):
-            sl_list.append(sl)
+        queues = {
+            'companies': deque(i for i in company_id_list if i not in results['companies']),
+            'securitiesList': deque(i for i in company_id_list if i not in results['securitiesList']),
+            'securities': deque(),
+        }
+        for company_id in company_id_list:
+            if company_id in results['securitiesList']:
+                queues['securities'].extend(Universe.NotDone(results['securitiesList'][company_id],
+                                                             results['securities']))
+
+        bars = {stage: tqdm(desc=stage, total=len(queues[stage]), position=position)
+                for position, stage in enumerate(stages)}
+
+        def Next():
+            if queues['securities']:
+                return 'securities'
+            if queues['securitiesList'] and len(queues['securities']) < queueSize:
+                return 'securitiesList'
+            if queues['companies']:
+                return 'companies'
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        running = {}
+
+        try:
+            while True:
+                stage = Next()
+                while stage is not None and len(running) < workers:
+                    i = queues[stage].popleft()
+                    running[executor.submit(functions[stage], i)] = (stage, i)
+                    stage = Next()
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, i = running.pop(future)
+                    bars[stage].update()
+
+                    error = future.exception()
+                    if error is not None:
+                        if failures is None:
+                            raise error
+                        errorText = '{}: {}'.format(type(error).__name__, error)
+                        failures[stage][i] = errorText
+                        if checkpoint is not None:
+                            checkpoint.Fail(stage, i, errorText)
+                        continue
+
+                    results[stage][i] = future.result()
+                    if checkpoint is not None:
+                        checkpoint.Save(stage, i, results[stage][i])
+
+                    if stage == 'securitiesList':
+                        security_id_list = Universe.NotDone(results[stage][i], results['securities'])
+                        queues['securities'].extend(security_id_list)
+                        bars['securities'].total += len(security_id_list)
+                        bars['securities'].refresh()
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for bar in bars.values():
+                bar.close()
+            if checkpoint is not None:
+                checkpoint.Close()
+
+        companies = Universe.Concat(results['companies'], company_id_list, rows=True)
+        securitiesList = Universe.Concat(results['securitiesList'], company_id_list)
+        security_id_list = securitiesList['id'].tolist() if len(securitiesList) else []
+        securities = Universe.Concat(results['securities'], security_id_list, rows=True)
+
+        return companies, securitiesList, securities
 
-        pool.close()
-        pool.join()
+    @staticmethod
+    def NotDone(securitiesList, securitiesResults):
+        """ Returns ids of the listed securities, which are not collected yet. """
 
-        securitiesList = pd.concat(sl_list)
+        if len(securitiesList) == 0:
+            return []
 
-        return securitiesList
+        return [i for i in securitiesList['id'].tolist() if i not in securitiesResults]
 
     @staticmethod
-    def Securities(security_id_list):
-        """ Returns the list of all securities with general information about them (in DataFrame format). """
+    def Concat(results, id_list, rows=False):
+        """ Concatenates {id: result} DataFrames (Series, if `rows`, every one is a row of the result)
+        in the order of `id_list` (missing ids are skipped).
+        """
 
-        pool = multiprocessing.Pool(processes=CONFIG_PARSER['processes'])
+        frames = [results[i] for i in id_list if i in results]
+        if len(frames) == 0:
+            return pd.DataFrame()
 
-        si_list = []
-        for si in tqdm(pool.imap(Company.SecurityInfo, security_id_list), total=len(security_id_list)):
-            si_list.append(si)
+        if rows:
+            return pd.concat(frames, axis=1).T
 
-        pool.close()
-        pool.join()
+        return pd.concat(frames)
+
+    @staticmethod
+    def CheckpointOf(checkpoint):
+        """ Returns `technical.checkpoint.Checkpoint` for the provided directory (or instance, or `None`). """
+
+        if checkpoint is None or isinstance(checkpoint, Checkpoint):
+            return checkpoint
 
-        securities = pd.concat(si_list, axis=1).T
+        return Checkpoint(checkpoint)
+
+    # Bulk files
+    @staticmethod
+    def CompaniesFromFile(path, chunksize=CONFIG_PARSER['bulk_chunksize']):
+        """ Returns all companies DataFrame (indexed by `id`) read from the bulk export,
+        companies without fundamentals or stock prices are filtered out (as in `CompaniesList`).
+        """
+
+        companies = Universe.ReadBulkFile(path, COMPANY_DATES, Universe.HasData, chunksize)
+        companies.index = companies['id'].values
+
+        return companies
+
+    @staticmethod
+    def SecuritiesFromFile(path, company_id_list=None, chunksize=CONFIG_PARSER['bulk_chunksize']):
+        """ Returns all securities DataFrame (indexed by `id`) read from the bulk export,
+        only the securities of the provided companies are kept (if `company_id_list` is provided).
+        """
+
+        rowFilter = None
+        if company_id_list is not None:
+            company_id_set = set(company_id_list)
+            rowFilter = lambda chunk: chunk['company_id'].isin(company_id_set)
+
+        securities = Universe.ReadBulkFile(path, SECURITY_DATES, rowFilter, chunksize)
+        securities.index = securities['id'].values
 
         return securities
+
+    @staticmethod
+    def ReadBulkFile(path, dates=(), rowFilter=None, chunksize=CONFIG_PARSER['bulk_chunksize']):
+        """ Reads the bulk CSV export chunk by chunk (the whole file is never parsed at once):
+            --- `dates` - columns converted to datetime;
+            --- `rowFilter` - function, which returns boolean mask of the rows to keep in the provided chunk.
+        """
+
+        chunks = []
+        for chunk in Universe.BulkChunks(path, chunksize):
+            for date in dates:
+                if date in chunk:
+                    chunk[date] = pd.to_datetime(chunk[date])
+            if rowFilter is not None:
+                chunk = chunk[rowFilter(chunk)]
+            chunks.append(chunk)
+
+        if len(chunks) == 0:
+            raise Exception('{}: no CSV data in the bulk file.'.format(path))
+
+        frame = pd.concat(chunks, ignore_index=True)
+
+        return frame
+
+    @staticmethod
+    def BulkChunks(path, chunksize):
+        """ Yields DataFrame chunks of the CSV file (every CSV file, if ZIP archive is provided). """
+
+        dtype = {column: str for column in BULK_STRING_COLUMNS}
+
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if not name.lower().endswith('.csv'):
+                        continue
+                    with archive.open(name) as f:
+                        with pd.read_csv(f, dtype=dtype, chunksize=chunksize) as reader:
+                            for chunk in reader:
+                                yield chunk
+        else:
+            with pd.read_csv(path, dtype=dtype, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk
+
+    @staticmethod
+    def HasData(chunk):
+        """ Returns boolean mask of companies, which have fundamentals and stock prices
+        (if the respective flags are presented in the export).
+        """
+
+        mask = pd.Series(True, index=chunk.index)
+        for column in ['has_fundamentals', 'has_stock_prices']:
+            if column in chunk:
+                mask &= chunk[column].astype(str).str.lower() == 'true'
+
+        return mask
@@ -18,32 +18,114 @@ activeTests = RF_TESTS[RF_TESTS['Value'] == 'on']['Test'].unique()
 RF_TESTS = RF_TESTS[RF_TESTS['Test'].isin(activeTests)]
 
 
+def ParseTests(testDf):
+    """ Returns the list of (testName, controlSum, {field: coefficient}) tuples of the form's tests,
+    `controlSum` is `None`, if the test's first `controlSum` field (marked with `on`) is missed or isn't a string.
+    """
+
+    tests = []
+    for testName in testDf['Test'].unique():
+        if testName == 'no_test':
+            continue
+
+        test = testDf[testDf['Test'] == testName]
+
+        controlSums = test.loc[test['Value'] == 'on', 'Field'].values
+        controlSum = controlSums[0] if len(controlSums) > 0 and type(controlSums[0]) == str else None
+
+        coefficients = {field: value for field, value in zip(test['Field'], test['Value']) if value != 'on'}
+
+        tests.append((testName, controlSum, coefficients))
+
+    return tests
+
+
+def CompileTests(tests):
+    """ Returns the form's tests (consider `ParseTests`) compiled over the union of their fields:
+        --- `fields` - union of the tests' fields and control sums;
+        --- `coefficients` - signed fields x tests matrix: +1 for the control sum, -coefficient for its fields,
+        hence differences of all control sums are `values @ coefficients`;
+        --- `inTest` - fields x tests mask of the tests' fields (with control sums);
+        --- `nonNumeric` - fields x tests mask of the non-numeric coefficients;
+        --- `controlSums` - positions of the tests' control sums in `fields` (-1, if `controlSum` is `None`).
+    """
+
+    fields = []
+    for _, controlSum, coefficients in tests:
+        fields.extend(field for field in coefficients if isinstance(field, str))
+        if controlSum is not None:
+            fields.append(controlSum)
+    fields = list(dict.fromkeys(fields))
+
+    position = {field: i for i, field in enumerate(fields)}
+    shape = (len(fields), len(tests))
+
+    compiledTests = {
+        'names': [testName for testName, _, _ in tests],
+        'fields': pd.Index(fields),
+        'coefficients': np.zeros(shape),
+        'inTest': np.zeros(shape, dtype=bool),
+        'nonNumeric': np.zeros(shape, dtype=bool),
+        'controlSums': np.full(len(tests), -1, dtype=np.int64),
+    }
+
+    for t, (testName, controlSum, coefficients) in enumerate(tests):
+        if controlSum is None:
+            continue
+
+        for field, coefficient in coefficients.items():
+            if field not in position:
+                continue
+            f = position[field]
+
+            compiledTests['inTest'][f, t] = True
+            if isinstance(coefficient, (int, float, np.number)):
+                compiledTests['coefficients'][f, t] -= np.nan_to_num(coefficient)
+            else:
+                compiledTests['nonNumeric'][f, t] = True
+
+        compiledTests['controlSums'][t] = position[controlSum]
+        compiledTests['coefficients'][position[controlSum], t] += 1
+        compiledTests['inTest'][position[controlSum], t] = True
+
+    return compiledTests
+
+
+TESTS_BY_RF = {RF: ParseTests(RF_TESTS[RF_TESTS['RF'] == RF]) for RF in RF_TESTS['RF'].unique()}
+COMPILED_TESTS = {RF: CompileTests(tests) for RF, tests in TESTS_BY_RF.items()}
+
+
 def CollectCleanFields(company):
     """ Returns DataFrame with fields from all of 3 forms. """
 
     RFname_list = FIELDS_BY_MAIN_RF.keys()
 
-    cleanFields = [ProcessRF(company, RFname) for RFname in RFname_list]
+    # tests are applied once for all forms
+    errorRows = CollectErrorsDf(company).any(axis=1)
+
+    cleanFields = [ProcessRF(company, RFname, errorRows) for RFname in RFname_list]
     cleanFields = pd.concat(cleanFields, axis=1)
 
     return cleanFields
 
 
-def ProcessRF(company, RFname):
+def ProcessRF(company, RFname, errorRows=None):
     """ Returns RF with cleaned rows:
     - only rows from filing dates left;
     - rows with errors filled with NaNs.
+    `errorRows` - boolean Series (by filing dates) of rows with errors, collected if not provided.
     """
 
-    errorRows = CollectErrorsDf(company).any(axis=1)
+    if errorRows is None:
+        errorRows = CollectErrorsDf(company).any(axis=1)
     fdi = errorRows.index
 
-    RF = ExtractReportingForm(company, RFname)
+    RF = ExtractReportingForm(company, RFname, copy=False)
 
     fields = FIELDS_BY_MAIN_RF[RFname]
     fields = [field for field in fields if field in RF.columns]
 
-    RFclean = RF.loc[fdi, fields]
+    RFclean = RF.loc[fdi, fields].copy()
     RFclean.loc[errorRows, :] = np.nan
 
     return RFclean
@@ -55,89 +137,77 @@ def CollectErrorsDf(company):
     """
 
     fdi = company.filingDates.index.copy()
-    normalizer = company.BS.loc[fdi, 'Total Assets'].copy()
+    normalizer = company.BS.loc[fdi, 'Total Assets'].values.astype(np.float64)
 
-    errorsDf = pd.DataFrame(index=fdi)
+    errors = {}
 
     for RFname in ['BS', 'IS', 'CF']:
 
-        RF = ExtractReportingForm(company, RFname)
+        RF = ExtractReportingForm(company, RFname, copy=False)
         RF = RF.loc[fdi, :]
 
-        testDf = RF_TESTS[RF_TESTS['RF'] == RFname].copy()
-        testDict = {testName: testDf[testDf['Test'] == testName].copy() for
-                    testName in testDf['Test'].unique() if
-                    testName != 'no_test'}
-
-        for testName in testDict:
+        compiledTests = COMPILED_TESTS.get(RFname) or CompileTests([])
+        results = ApplyTests(RF.values.astype(np.float64), RF.columns, compiledTests, normalizer, threshold=0.03)
 
-            test = testDict[testName]
+        for testName, result in zip(compiledTests['names'], results.T):
+            errors[testName] = result
 
-            # noinspection PyBroadException
-            try:
-                result = ApplyTestRF(RF, test, normalizer, threshold=0.03)
-            except:
-                result = True
-
-            errorsDf[testName] = result
+    errorsDf = pd.DataFrame(errors, index=fdi)
 
     return errorsDf
 
 
-def ApplyTestRF(RF, test, normalizer, threshold=0.03):
-    """ Checks if all totals collected properly (look at `BS_VALIDATION_DICT` for more details).
-    Returns df, where 1 means `error` and 0 means `ok`.
+def ApplyTests(values, columns, compiledTests, normalizer, threshold=0.03):
+    """ Checks if all totals collected properly (look at `CompileTests` for more details).
+    Returns boolean array (filings x tests), where True means `error` and False means `ok`.
+        --- `values` - filings x fields array of the reporting form, `columns` - its fields;
+        --- `normalizer` - `Total Assets` of the filings.
+    A test is an error for all filings, if it can't be applied (no control sum in the form or
+    a non-numeric coefficient of the form's field).
     """
 
-    AssertTest(test)
-
-    controlSum = test.loc[test['Value'] == 'on', 'Field'].values[0]
-    controlSumCols_dict = {field: value for field, value in zip(test['Field'], test['Value'])
-                           if field in RF.columns and value != 'on'}
+    ct = compiledTests
 
-    for col in controlSumCols_dict:
-        RF[col] = RF[col] * controlSumCols_dict[col]
+    if len(ct['fields']) == 0:
+        return np.ones((len(values), len(ct['names'])), dtype=bool)
 
-    RF['diff'] = RF[controlSum] - RF[controlSumCols_dict.keys()].sum(axis=1)
-    RF['diff_normed'] = RF['diff'] / normalizer
-    RF['diff_normed_abs'] = RF['diff_normed'].abs()
+    # filings x tests' fields (absent fields are 0)
+    positions = pd.Index(columns).get_indexer(ct['fields'])
+    present = positions >= 0
+    X = np.zeros((len(values), len(present)))
+    X[:, present] = values[:, positions[present]]
 
-    test = (RF['diff_normed_abs'] > threshold)
-    zero = (RF[list(controlSumCols_dict.keys()) + [controlSum]] == 0).all(axis=1)
+    controlSums = ct['controlSums']
+    failed = (controlSums < 0) | (ct['nonNumeric'] & present[:, None]).any(axis=0)
+    failed[controlSums >= 0] |= ~present[controlSums[controlSums >= 0]]
 
-    resultsDF = pd.DataFrame()
-    resultsDF['test'] = test
-    resultsDF['zero'] = zero
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff = np.nan_to_num(X) @ ct['coefficients']
+        test = (np.abs(diff / normalizer[:, None]) > threshold) & ~np.isnan(X[:, controlSums.clip(0)])
 
-    result = resultsDF.any(axis=1)
+        zero = ((X != 0).astype(np.float64) @ ct['inTest']) == 0
 
-    return result
+    results = test | zero | failed
 
+    return results
 
-def AssertTest(test):
-    """ Checks if provided `test` doesn't contain errors. """
 
-    assertionText = 'ControlSum test - more then 1 `RF`.'
-    assert test['RF'].nunique() == 1, assertionText
-
-    assertionText = 'ControlSum test - more then 1 `controlSum`.'
-    controlSum = test.loc[test['Value'] == 'on', 'Field'].values[0]
-    assert type(controlSum) == str, assertionText
-
-
-def ExtractReportingForm(company, RFname):
+def ExtractReportingForm(company, RFname, copy=True):
     """ SHOULD BE BASED ON COLLECTED COLS. """
-    """ Returns provided RF. """
+    """ Returns provided RF (company's frame itself, if not `copy`, it should not be modified then). """
 
     if RFname == 'BS':
-        RF = company.BS.copy()
+        RF = company.BS
     elif RFname == 'IS':
-        RF = company.IS.copy()
+        RF = company.IS
     elif RFname == 'CF':
-        RF = company.CF.copy()
+        RF = company.CF
     else:
         exceptionText = '{}: Wrong reporting form (should be: `BS`, `IS`, `CF`.'
         exceptionText = exceptionText.format(RFname)
         raise Exception(exceptionText)
 
+    if copy:
+        RF = RF.copy()
+
     return RF
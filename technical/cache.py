@@ -0,0 +1,129 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+import sqlite3
+import threading
+import hashlib
+import json
+import time
+import os
+
+CACHE = CONFIG_PARSER['cache']
+
+
+class ResponseCache(object):
+    """ Persistent on-disk cache of API responses (raw JSON) based on `sqlite3`:
+    - keys are URL and params (`api_key` excluded);
+    - time to live is set per endpoint (`None` - never expires, `0` - not cached);
+    - size is bounded (least recently used responses are evicted first);
+    - could be shared by many threads (each thread has its own connection) and processes (WAL journal).
+    """
+
+    def __init__(self, path, maxBytes=CACHE['max_bytes'], ttl=None):
+        self.path = os.path.normpath(path)
+        self.maxBytes = maxBytes
+        self.ttl = ttl if ttl is not None else CACHE['ttl']
+
+        self.local = threading.local()
+        self.setsCount = 0
+
+        with self.Connection() as con:
+            con.execute('CREATE TABLE IF NOT EXISTS responses ('
+                        'key TEXT PRIMARY KEY, endpoint TEXT, created REAL, accessed REAL, size INTEGER, content BLOB)')
+            con.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def Connection(self):
+        """ Returns connection of the current thread (creates it on the first call). """
+
+        con = getattr(self.local, 'con', None)
+
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            self.local.con = con
+
+        return con
+
+    def TTL(self, endpoint):
+        """ Returns time to live (in seconds) of the provided endpoint responses. """
+
+        ttl = self.ttl.get(endpoint, self.ttl['default'])
+
+        return ttl
+
+    def Get(self, key, endpoint):
+        """ Returns cached raw response if it is present and not expired, otherwise returns `None`. """
+
+        ttl = self.TTL(endpoint)
+        if ttl == 0:
+            return None
+
+        con = self.Connection()
+        row = con.execute('SELECT created, accessed, content FROM responses WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        created, accessed, content = row
+        now = time.time()
+
+        if ttl is not None and now - created > ttl:
+            return None
+
+        # LRU order is kept with 1 minute precision (to avoid a write on every hit)
+        if now - accessed > 60:
+            con.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        return content
+
+    def Set(self, key, endpoint, content):
+        """ Saves raw response (bytes). """
+
+        if self.TTL(endpoint) == 0:
+            return
+
+        now = time.time()
+
+        con = self.Connection()
+        con.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, endpoint, now, now, len(content), sqlite3.Binary(content)))
+
+        self.setsCount += 1
+        if self.setsCount % 100 == 0:
+            self.Evict()
+
+    def Evict(self):
+        """ Removes least recently used responses until the cache fits into `maxBytes`. """
+
+        con = self.Connection()
+        size = con.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+        if size > self.maxBytes:
+            excess = size - self.maxBytes
+            con.execute('DELETE FROM responses WHERE key IN ('
+                        'SELECT key FROM (SELECT key, size, SUM(size) OVER (ORDER BY accessed, key) AS cumSize '
+                        'FROM responses) WHERE cumSize - size < ?)', (excess,))
+
+    def Clear(self, endpoint=None):
+        """ Removes all responses (only the provided endpoint responses, if `endpoint` is provided). """
+
+        con = self.Connection()
+
+        if endpoint is None:
+            con.execute('DELETE FROM responses')
+        else:
+            con.execute('DELETE FROM responses WHERE endpoint = ?', (endpoint,))
+
+    @staticmethod
+    def Key(url, params):
+        """ Returns cache key for the provided request (`api_key` is excluded). """
+
+        params = {key: str(value) for key, value in params.items() if key != 'api_key'}
+        raw = url + '?' + json.dumps(params, sort_keys=True)
+
+        key = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+        return key
+
+
+DEFAULT_CACHE = ResponseCache(CACHE['path']) if CACHE['path'] is not None else None
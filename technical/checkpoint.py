@@ -0,0 +1,138 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+import threading
+import pickle
+import time
+import os
+
+CHECKPOINT = CONFIG_PARSER['checkpoint']
+
+
+class Checkpoint(object):
+    """ On-disk progress of a long crawl (e.g. `Universe`): completed and failed items are appended
+    to a per-stage log file as soon as they are collected, so the crawl could be resumed after a restart.
+    A record, which was not written completely (e.g. the process was killed), is dropped on loading.
+    """
+
+    def __init__(self, checkpointPath, maxAge=CHECKPOINT['max_age'], fsyncEvery=CHECKPOINT['fsync_every']):
+        """ `maxAge` - (in seconds) the records are cleared on opening, if the checkpoint was created earlier
+        (or its creation time is unknown), `None` - the checkpoint never expires.
+        `fsyncEvery` - records are written to the OS at once (survive a killed process), but are synced to the disk
+        (survive a power loss) every `fsyncEvery` records of a stage and on `Close`.
+        """
+
+        self.path = os.path.normpath(checkpointPath)
+        os.makedirs(self.path, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.fsyncEvery = max(1, fsyncEvery)
+        self.files = {}  # stage: log file opened for appending
+        self.pending = {}  # stage: number of records, which are not synced to the disk yet
+
+        self.created = self.CreationTime()
+        if self.created is None or (maxAge is not None and time.time() - self.created > maxAge):
+            self.Clear()
+
+    def Load(self, stage):
+        """ Returns (results, failures) dicts of the stage by item key, `failures` contain error texts
+        of the items, which are not completed yet.
+        """
+
+        results = {}
+        failures = {}
+
+        path = self.StagePath(stage)
+        if not os.path.exists(path):
+            return results, failures
+
+        with self.lock:
+            self.CloseStage(stage)
+            with open(path, 'rb+') as f:
+                while True:
+                    position = f.tell()
+                    try:
+                        status, key, value = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception:  # incomplete record
+                        f.truncate(position)
+                        break
+
+                    if status == 'done':
+                        results[key] = value
+                        failures.pop(key, None)
+                    else:
+                        failures[key] = value
+
+        return results, failures
+
+    def Save(self, stage, key, value):
+        """ Records the completed item. """
+
+        self.Append(stage, ('done', key, value))
+
+    def Fail(self, stage, key, errorText):
+        """ Records the failed item (with the error text). """
+
+        self.Append(stage, ('failed', key, errorText))
+
+    def Append(self, stage, record):
+        data = pickle.dumps(record)
+
+        with self.lock:
+            if stage not in self.files:
+                self.files[stage] = open(self.StagePath(stage), 'ab')
+                self.pending[stage] = 0
+
+            f = self.files[stage]
+            f.write(data)
+            f.flush()
+
+            self.pending[stage] += 1
+            if self.pending[stage] >= self.fsyncEvery:
+                os.fsync(f.fileno())
+                self.pending[stage] = 0
+
+    def Close(self):
+        """ Syncs the records to the disk and closes the log files (they are reopened by the next record). """
+
+        with self.lock:
+            for stage in list(self.files):
+                self.CloseStage(stage)
+
+    def CloseStage(self, stage):
+        f = self.files.pop(stage, None)
+        if f is None:
+            return
+
+        if self.pending.pop(stage, 0):
+            os.fsync(f.fileno())
+        f.close()
+
+    def Clear(self, stage=None):
+        """ Removes records of the stage (of all stages, if `stage` is `None`, the checkpoint is created anew). """
+
+        with self.lock:
+            for name in os.listdir(self.path):
+                if name.endswith('.log') and (stage is None or name == stage + '.log'):
+                    self.CloseStage(name[:-len('.log')])
+                    os.remove(os.path.join(self.path, name))
+
+            if stage is None:
+                self.created = time.time()
+                with open(os.path.join(self.path, 'created'), 'w') as f:
+                    f.write(repr(self.created))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def CreationTime(self):
+        """ Returns the creation time of the checkpoint (as `time.time()`), `None` - if it is unknown. """
+
+        try:
+            with open(os.path.join(self.path, 'created')) as f:
+                return float(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def StagePath(self, stage):
+        return os.path.join(self.path, stage + '.log')
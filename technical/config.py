@@ -1,14 +1,89 @@
 CONFIG_PARSER = {
 
     'processes': 10,
+    'async_limit': 100,  # max number of in-flight requests of `AsyncIntrinioAPI`
 
     'api_key': '...',  # replace '...' with your API-key
+    'base_url': 'https://api-v2.intrinio.com',  # could point to a local stand-in server (see `technical.replay`)
 
-    'timeout_regular': 10,  # timeout (in seconds) for regular requests
-    'timeout_bulk': 20,  # timeout (in seconds) for bulk requests
+    'timeout_regular': 10,  # max delay (in seconds) between retries of regular requests
+    'timeout_bulk': 20,  # max delay (in seconds) between retries of bulk requests
+
+    # (connect, read) timeouts (in seconds) of a single HTTP request, by `IntrinioAPI` method
+    'request_timeouts': {
+        'default': (5, 30),
+        'AllCompanies': (5, 120),
+        'StockPricesBySecurity': (5, 120),
+        'HistoricalDataForCompany': (5, 120),
+        'HistoricalDataForSecurity': (5, 120),
+        'StandardizedFinancials': (5, 60),
+    },
 
     'retry_regular': 7,  # number of retries in case of unsuccessful API-respond
 
+    # shared by all threads (consider `technical.rateLimiter`), should correspond to the plan's limit
+    'rate_limit': {
+        'requests_per_second': 25,
+        'burst': 25,
+        'backoff_base': 1,  # first backoff delay (in seconds), doubles with every attempt
+    },
+
+    # on-disk cache of API responses (consider `technical.cache`)
+    'cache': {
+        'path': None,  # path to the cache file (e.g. '/data/intrinio_cache.sqlite'), `None` - no caching
+        'max_bytes': 10 * 1024 ** 3,
+
+        # time to live (in seconds) by `IntrinioAPI` method: `None` - never expires, `0` - not cached
+        'ttl': {
+            'default': 24 * 60 * 60,
+            'AllCompanies': 0,  # the list detects new / changed companies (consider `Universe.Refresh`)
+            'StandardizedFinancials': None,  # filed reporting forms do not change
+            'LookupCompany': 24 * 60 * 60,
+            'LookupSecurity': 24 * 60 * 60,
+            'AllFundamentalsByCompany': 12 * 60 * 60,
+            'StockPricesBySecurity': 12 * 60 * 60,
+            'HistoricalDataForCompany': 12 * 60 * 60,
+            'HistoricalDataForSecurity': 12 * 60 * 60,
+        },
+    },
+
+    # bulk responses (prices, historical data) are decoded into typed columns (consider `parser.decoder`)
+    'fast_decoding': True,
+
+    # `Universe` built from bulk CSV/ZIP exports (consider `companiesFile` / `securitiesFile` of `Universe`)
+    'bulk_chunksize': 100000,  # rows parsed at once
+
+    # compact storage of reporting forms in `Company` (consider `parser.compactForm`)
+    'compact_forms': {
+        'enabled': False,
+        'dtype': 'float64',  # 'float32' halves the memory, but values are rounded
+    },
+
+    # building many companies at once (consider `parser.companyBatch`)
+    'batch': {
+        'companies': 10,  # companies built concurrently
+        'stage_workers': 50,  # threads for initialization stages of all companies
+        'request_workers': 50,  # threads for requests made within the stages (filings, securities)
+    },
+
+    # pipelined crawl of `Universe`: companies, securities lists and securities are requested concurrently
+    'universe_pipeline': {
+        'enabled': True,
+        'workers': 10,  # threads shared by all stages
+        'queue_size': 1000,  # max number of securities waiting for `SecurityInfo` (backpressure)
+    },
+
+    # on-disk progress of `Universe` crawl (consider `technical.checkpoint`)
+    'checkpoint': {
+        'max_age': 7 * 24 * 60 * 60,  # (in seconds) older checkpoints are cleared on opening, `None` - never expire
+        'fsync_every': 100,  # records are flushed to the OS at once, but synced to the disk in batches
+    },
+
+    # per-endpoint request metrics (consider `technical.telemetry`)
+    'telemetry': {
+        'latency_buckets': [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60],  # upper bounds (in seconds)
+    },
+
     'security_coverage_threshold': 0.75,  # for details consider `MainSecurity` method of `Company` class
 
     'filing_dates': {
@@ -0,0 +1,83 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+import threading
+import random
+import time
+
+RATE_LIMIT = CONFIG_PARSER['rate_limit']
+
+
+class TokenBucket(object):
+    """ Thread-safe token bucket: not more than `rate` requests per second on average
+    (and not more than `burst` requests at once).
+
+    Tokens are reserved in advance, so waiting requests are served in the order of reservation.
+    The bucket is shared by all threads, pools and `IntrinioAPI` instances (consider `DEFAULT_RATE_LIMITER`).
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else rate)
+
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def Refill(self):
+        """ Adds tokens accumulated since the last update (should be called under the lock). """
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def Reserve(self):
+        """ Reserves a token, returns the time (in seconds) to wait before using it. """
+
+        with self.lock:
+            self.Refill()
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate)
+
+        return wait
+
+    def Acquire(self):
+        """ Blocks until a token is available, returns the time (in seconds) spent waiting. """
+
+        wait = self.Reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+    def Penalize(self, delay):
+        """ Pauses all the bucket users for `delay` seconds (e.g. after a rate-limit response).
+        Concurrent penalties do not add up - the longest one is applied.
+        """
+
+        with self.lock:
+            self.Refill()
+            self.tokens = min(self.tokens, -delay * self.rate)
+
+
+def Backoff(attempt, cap, base=RATE_LIMIT['backoff_base']):
+    """ Returns jittered exponential backoff delay (in seconds) for the provided attempt (starting from 0). """
+
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+
+    return delay
+
+
+def RetryAfter(headers):
+    """ Returns `Retry-After` header value (in seconds) if any, otherwise returns `None`. """
+
+    value = headers.get('Retry-After')
+
+    try:
+        retryAfter = float(value)
+    except (TypeError, ValueError):
+        retryAfter = None
+
+    return retryAfter
+
+
+DEFAULT_RATE_LIMITER = TokenBucket(RATE_LIMIT['requests_per_second'], RATE_LIMIT['burst'])
@@ -0,0 +1,149 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+import threading
+import hashlib
+import random
+import json
+import time
+import os
+
+
+def FixtureKey(path, params):
+    """ Returns fixture name for the provided request (host and `api_key` are ignored). """
+
+    params = {key: str(value) for key, value in params.items() if key != 'api_key'}
+    raw = path + '?' + json.dumps(params, sort_keys=True)
+
+    key = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    return key
+
+
+class RecordingTransport(object):
+    """ Wraps a transport (see `parser.transport`) and saves every response to `fixturesPath` folder
+    (one JSON file per request), so it could be replayed later by `ReplayServer`:
+        api = IntrinioAPI(transport=RecordingTransport(DEFAULT_TRANSPORT, 'fixtures'))
+    """
+
+    def __init__(self, transport, fixturesPath):
+        self.transport = transport
+        self.path = os.path.normpath(fixturesPath)
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def Get(self, url, params, timeout):
+        """ Sends request through the wrapped transport and records the response. """
+
+        r = self.transport.Get(url, params, timeout)
+
+        if r.status_code != 429:
+            path = urlsplit(url).path
+            fixture = {
+                'path': path,
+                'params': {key: str(value) for key, value in params.items() if key != 'api_key'},
+                'status': r.status_code,
+                'body': r.text,
+            }
+            RecordingTransport.Save(os.path.join(self.path, FixtureKey(path, params) + '.json'), fixture)
+
+        return r
+
+    @staticmethod
+    def Save(path, fixture):
+        """ Writes the fixture atomically (safe for concurrent recording threads). """
+
+        tmpPath = '{}.{}.tmp'.format(path, threading.get_ident())
+        with open(tmpPath, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f)
+        os.replace(tmpPath, path)
+
+
+class ReplayServer(object):
+    """ Local HTTP stand-in for the API, which replays fixtures recorded by `RecordingTransport`.
+
+        --- `latency` / `jitter` - response delay (in seconds) is `latency` plus uniform noise within ±`jitter`;
+        --- `errorRate` - share of responses replaced with HTTP 500;
+        --- `rateLimitRate` - share of responses replaced with HTTP 429.
+
+    Requests without a fixture get HTTP 404 with API-like `error` payload.
+    `IntrinioAPI(baseUrl=server.url)` (or `CONFIG_PARSER['base_url']`) points the client to the server.
+    """
+
+    def __init__(self, fixturesPath, latency=0.05, jitter=0.02, errorRate=0.0, rateLimitRate=0.0,
+                 host='127.0.0.1', port=0, seed=None):
+        self.path = os.path.normpath(fixturesPath)
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.rateLimitRate = rateLimitRate
+        self.random = random.Random(seed)
+
+        self.server = ThreadingHTTPServer((host, port), ReplayServer.Handler(self))
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def Start(self):
+        """ Starts serving in a background thread, returns the server. """
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def Stop(self):
+        """ Stops the server. """
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def Respond(self, rawPath):
+        """ Returns (status, body) for the provided request path (with query). """
+
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+
+        draw = self.random.random()
+        if draw < self.rateLimitRate:
+            return 429, json.dumps({'error': 'Too Many Requests', 'message': 'Replayed rate limit'})
+        if draw < self.rateLimitRate + self.errorRate:
+            return 500, json.dumps({'error': 'Internal Server Error', 'message': 'Replayed error'})
+
+        split = urlsplit(rawPath)
+        params = dict(parse_qsl(split.query, keep_blank_values=True))
+        fixturePath = os.path.join(self.path, FixtureKey(split.path, params) + '.json')
+
+        if not os.path.exists(fixturePath):
+            return 404, json.dumps({'error': 'Not Found', 'message': 'No fixture for {}'.format(split.path)})
+
+        with open(fixturePath, encoding='utf-8') as f:
+            fixture = json.load(f)
+
+        return fixture['status'], fixture['body']
+
+    @staticmethod
+    def Handler(replayServer):
+        """ Returns request handler class bound to the provided server. """
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, body = replayServer.Respond(self.path)
+                body = body.encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return ReplayHandler
@@ -0,0 +1,50 @@
+from concurrent.futures import Future
+import threading
+
+
+class SingleFlight(object):
+    """ Request-scoped coalescing of identical calls:
+    - concurrent calls with the same key share one execution (others wait for its result);
+    - repeated calls with the same key return the memoized result.
+    Failed calls are not memoized. Returned objects are shared between callers, so they should not be mutated.
+
+    Intended to live as long as a single `Company` / `Universe` build (or a research session).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def Do(self, key, function, *args, **kwargs):
+        """ Returns the result of `function(*args, **kwargs)`, executes it only once per `key`. """
+
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self.calls[key] = call
+
+        if leader:
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as e:
+                with self.lock:
+                    del self.calls[key]
+                call.set_exception(e)
+                raise
+            call.set_result(result)
+
+        return call.result()
+
+    def Forget(self, key=None):
+        """ Removes the memoized result for the provided key (all results, if `key` is `None`). """
+
+        with self.lock:
+            if key is None:
+                self.calls.clear()
+            else:
+                self.calls.pop(key, None)
+
+    def __len__(self):
+        return len(self.calls)
@@ -0,0 +1,118 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+
+
+class TaskGraph(object):
+    """ Set of named tasks with dependencies, which are executed on a single thread pool:
+    every task starts as soon as all of its dependencies are completed.
+
+        graph = TaskGraph()
+        graph.Add('securitiesList', Company.SecuritiesList, company_id)
+        graph.Add('securities', lambda sl: Company.Securities(sl['id'].tolist()), dependencies=['securitiesList'])
+        results = graph.Run()
+
+    Results of the dependencies are passed to the task as leading positional arguments (in the provided order).
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self.timings = {}
+
+    def Add(self, name, function, *args, dependencies=(), **kwargs):
+        """ Adds the task `function(*dependenciesResults, *args, **kwargs)`. """
+
+        assertionText = '{}: task is already added.'.format(name)
+        assert name not in self.tasks, assertionText
+
+        self.tasks[name] = (function, args, kwargs, list(dependencies))
+
+    def Run(self, executor=None, processes=CONFIG_PARSER['processes'], targets=None, known=None):
+        """ Executes all tasks, returns dict with their results (by task name).
+        If a task fails, the tasks, which are not started yet, are cancelled and the exception is raised.
+            --- `executor` - `concurrent.futures.Executor` to run the tasks on (a new thread pool, if not provided);
+            --- `targets` - names of the tasks to execute (with their dependencies), all tasks by default;
+            --- `known` - dict with already known results of some tasks (they are not executed again).
+        """
+
+        for name, (_, _, _, dependencies) in self.tasks.items():
+            for dependency in dependencies:
+                assertionText = '{}: unknown dependency `{}`.'.format(name, dependency)
+                assert dependency in self.tasks, assertionText
+
+        ownExecutor = executor is None
+        if ownExecutor:
+            executor = ThreadPoolExecutor(max_workers=processes)
+
+        results = dict(known or {})
+        self.timings = {}
+        runStart = time.perf_counter()
+
+        waiting = {name: self.tasks[name] for name in self.Required(targets, results)}
+        running = {}
+
+        try:
+            while waiting or running:
+                for name in [name for name, task in waiting.items() if all(d in results for d in task[3])]:
+                    function, args, kwargs, dependencies = waiting.pop(name)
+                    dependenciesResults = [results[dependency] for dependency in dependencies]
+                    future = executor.submit(self.Timed, name, runStart, function, *dependenciesResults, *args,
+                                             **kwargs)
+                    running[future] = name
+
+                if not running:
+                    raise Exception('Cyclic dependencies between tasks: {}.'.format(', '.join(waiting)))
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            if ownExecutor:
+                executor.shutdown(wait=True)
+
+        return results
+
+    def Required(self, targets, known):
+        """ Returns names of the tasks, which should be executed to get `targets` (all tasks, if `None`),
+        given the `known` results.
+        """
+
+        if targets is None:
+            targets = list(self.tasks)
+
+        required = []
+        stack = [name for name in targets if name not in known]
+        while stack:
+            name = stack.pop()
+            if name in required:
+                continue
+            assertionText = '{}: unknown task.'.format(name)
+            assert name in self.tasks, assertionText
+
+            required.append(name)
+            stack.extend(d for d in self.tasks[name][3] if d not in known)
+
+        return [name for name in self.tasks if name in required]
+
+    def Timed(self, name, runStart, function, *args, **kwargs):
+        """ Executes the task and records its start time and duration (in seconds, relative to the start of `Run`). """
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            self.timings[name] = {'start': start - runStart, 'end': end - runStart, 'seconds': end - start}
+
+    def Report(self):
+        """ Returns text table with timings of the executed tasks (ordered by start time). """
+
+        lines = ['{:<24}{:>10}{:>10}{:>10}'.format('task', 'start', 'end', 'seconds')]
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1]['start']):
+            lines.append('{:<24}{:>10.2f}{:>10.2f}{:>10.2f}'.format(name, timing['start'], timing['end'],
+                                                                    timing['seconds']))
+
+        return '\n'.join(lines)
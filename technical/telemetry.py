@@ -0,0 +1,165 @@
+from ..technical.config import CONFIG_PARSER
+# --------------------------------------------
+import threading
+import bisect
+import json
+
+LATENCY_BUCKETS = CONFIG_PARSER['telemetry']['latency_buckets']
+
+
+class EndpointStats(object):
+    """ Counters and latency histogram of a single endpoint. """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucketCounts = [0] * (len(buckets) + 1)  # the last one is `+Inf`
+
+        self.requests = 0
+        self.latencySum = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.throttled = 0
+        self.rateLimitWait = 0.0
+        self.cacheHits = 0
+        self.errors = {}
+
+    def Add(self, latency, nbytes, retries, throttled, rateLimitWait, error):
+        self.bucketCounts[bisect.bisect_left(self.buckets, latency)] += 1
+
+        self.requests += 1
+        self.latencySum += latency
+        self.bytes += nbytes
+        self.retries += retries
+        self.throttled += throttled
+        self.rateLimitWait += rateLimitWait
+
+        if error is not None:
+            errorClass = type(error).__name__
+            self.errors[errorClass] = self.errors.get(errorClass, 0) + 1
+
+    def Quantile(self, q):
+        """ Returns upper bound of the latency bucket, which contains the `q` quantile. """
+
+        if self.requests == 0:
+            return None
+
+        rank = q * self.requests
+        cumCount = 0
+        for bound, count in zip(self.buckets + [float('inf')], self.bucketCounts):
+            cumCount += count
+            if cumCount >= rank:
+                return bound
+
+    def ToDict(self):
+        d = {
+            'requests': self.requests,
+            'latency_sum': self.latencySum,
+            'latency_mean': self.latencySum / self.requests if self.requests else None,
+            'latency_p50': self.Quantile(0.5),
+            'latency_p95': self.Quantile(0.95),
+            'latency_p99': self.Quantile(0.99),
+            'latency_histogram': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.bucketCounts)),
+            'bytes': self.bytes,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'rate_limit_wait': self.rateLimitWait,
+            'cache_hits': self.cacheHits,
+            'errors': dict(self.errors),
+        }
+
+        return d
+
+
+class Telemetry(object):
+    """ Thread-safe per-endpoint request metrics: latency histogram, response size, retries,
+    rate-limit responses and waiting, cache hits and errors (by class).
+    Could be queried in process (`Stats`, `Snapshot`) and exported as JSON or Prometheus text.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = sorted(buckets)
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def Stats(self, endpoint):
+        """ Returns `EndpointStats` of the provided endpoint (creates it on the first call). """
+
+        stats = self.endpoints.get(endpoint)
+
+        if stats is None:
+            with self.lock:
+                stats = self.endpoints.setdefault(endpoint, EndpointStats(self.buckets))
+
+        return stats
+
+    def Record(self, endpoint, latency, nbytes=0, retries=0, throttled=0, rateLimitWait=0.0, error=None):
+        """ Records a finished (successful or not) request. """
+
+        stats = self.Stats(endpoint)
+        with self.lock:
+            stats.Add(latency, nbytes, retries, throttled, rateLimitWait, error)
+
+    def RecordCacheHit(self, endpoint):
+        """ Records a request served from the cache. """
+
+        stats = self.Stats(endpoint)
+        with self.lock:
+            stats.cacheHits += 1
+
+    def Reset(self):
+        with self.lock:
+            self.endpoints = {}
+
+    def Snapshot(self):
+        """ Returns dict with metrics of all endpoints. """
+
+        with self.lock:
+            snapshot = {str(endpoint): stats.ToDict() for endpoint, stats in self.endpoints.items()}
+
+        return snapshot
+
+    def ToJson(self, **kwargs):
+        return json.dumps(self.Snapshot(), **kwargs)
+
+    def ToPrometheus(self, prefix='intrinio'):
+        """ Returns metrics in Prometheus text exposition format. """
+
+        snapshot = self.Snapshot()
+        lines = []
+
+        name = '{}_request_duration_seconds'.format(prefix)
+        lines.append('# HELP {} Duration of API requests (including retries and rate limiter waiting).'.format(name))
+        lines.append('# TYPE {} histogram'.format(name))
+        for endpoint, stats in snapshot.items():
+            cumCount = 0
+            for bound, count in stats['latency_histogram'].items():
+                cumCount += count
+                lines.append('{}_bucket{{endpoint="{}",le="{}"}} {}'.format(name, endpoint, bound, cumCount))
+            lines.append('{}_sum{{endpoint="{}"}} {}'.format(name, endpoint, stats['latency_sum']))
+            lines.append('{}_count{{endpoint="{}"}} {}'.format(name, endpoint, stats['requests']))
+
+        counters = [
+            ('response_bytes_total', 'bytes', 'Size of API responses.'),
+            ('retries_total', 'retries', 'Retried API request attempts.'),
+            ('throttled_total', 'throttled', 'Rate-limit (HTTP 429) API responses.'),
+            ('rate_limit_wait_seconds_total', 'rate_limit_wait', 'Time spent waiting for the rate limiter.'),
+            ('cache_hits_total', 'cache_hits', 'API requests served from the cache.'),
+        ]
+        for suffix, key, description in counters:
+            name = '{}_{}'.format(prefix, suffix)
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} counter'.format(name))
+            for endpoint, stats in snapshot.items():
+                lines.append('{}{{endpoint="{}"}} {}'.format(name, endpoint, stats[key]))
+
+        name = '{}_errors_total'.format(prefix)
+        lines.append('# HELP {} Failed API requests.'.format(name))
+        lines.append('# TYPE {} counter'.format(name))
+        for endpoint, stats in snapshot.items():
+            for errorClass, count in stats['errors'].items():
+                lines.append('{}{{endpoint="{}",error_class="{}"}} {}'.format(name, endpoint, errorClass, count))
+
+        return '\n'.join(lines) + '\n'
+
+
+DEFAULT_TELEMETRY = Telemetry()